@@ -0,0 +1,124 @@
+from collections import Counter
+from db_handler import DB_NAME, session
+
+# Score histogram: 10 buckets of 10 points (100 falls into the last one)
+HIST_BUCKETS = 10
+
+def init_analytics(db_name=DB_NAME):
+    with session(db_name) as conn:
+        c = conn.cursor()
+        # Per-day / per-company / per-job-role counts (avg score = score_sum / scans)
+        c.execute('''CREATE TABLE IF NOT EXISTS rollup_daily (
+                day TEXT,
+                company_name TEXT,
+                job_role TEXT,
+                scans INTEGER,
+                score_sum REAL,
+                PRIMARY KEY (day, company_name, job_role))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS rollup_score_hist (
+                company_name TEXT,
+                job_role TEXT,
+                bucket INTEGER,
+                scans INTEGER,
+                PRIMARY KEY (company_name, job_role, bucket))''')
+        c.execute('''CREATE TABLE IF NOT EXISTS rollup_missing_skills (
+                company_name TEXT,
+                job_role TEXT,
+                skill TEXT,
+                misses INTEGER,
+                PRIMARY KEY (company_name, job_role, skill))''')
+        # High-water mark: every scan with id <= last_scan_id is already rolled up
+        c.execute("CREATE TABLE IF NOT EXISTS rollup_state (id INTEGER PRIMARY KEY CHECK (id = 1), last_scan_id INTEGER)")
+        c.execute("INSERT OR IGNORE INTO rollup_state VALUES (1, 0)")
+
+def refresh_rollups(db_name=DB_NAME):
+    """
+    Folds scans added since the last refresh into the rollup tables.
+    Cost is proportional to the number of new scans, not the size of the table.
+    Returns the number of scans processed.
+    """
+    high_sql = "SELECT COALESCE(MAX(id), 0) FROM scans"
+    last_sql = "SELECT last_scan_id FROM rollup_state WHERE id = 1"
+    # Plain read first: most refreshes find nothing new and must not queue behind the job worker for the write lock
+    with session(db_name) as conn:
+        if conn.execute(high_sql).fetchone()[0] <= conn.execute(last_sql).fetchone()[0]:
+            return 0
+
+    with session(db_name) as conn:
+        # Take the write lock, then re-check, so two sessions can't roll up the same scans
+        conn.execute("BEGIN IMMEDIATE")
+        last = conn.execute(last_sql).fetchone()[0]
+        high = conn.execute(high_sql).fetchone()[0]
+        if high <= last:
+            return 0
+
+        new_scans = '''FROM scans s LEFT JOIN users u ON u.username = s.user_name
+                       WHERE s.id > ? AND s.id <= ?'''
+        company = "COALESCE(u.company_name, 'General')"
+        role = "COALESCE(s.job_role, 'General')"
+
+        conn.execute(f'''INSERT INTO rollup_daily
+                SELECT date(s.timestamp), {company}, {role}, COUNT(*), SUM(s.score) {new_scans}
+                GROUP BY 1, 2, 3
+                ON CONFLICT(day, company_name, job_role) DO UPDATE SET
+                    scans = scans + excluded.scans, score_sum = score_sum + excluded.score_sum''', (last, high))
+        conn.execute(f'''INSERT INTO rollup_score_hist
+                SELECT {company}, {role}, MIN(CAST(s.score / 10 AS INTEGER), {HIST_BUCKETS - 1}), COUNT(*) {new_scans}
+                GROUP BY 1, 2, 3
+                ON CONFLICT(company_name, job_role, bucket) DO UPDATE SET scans = scans + excluded.scans''', (last, high))
+
+        # Missing skills are stored as a comma-joined list, so they are split in Python
+        misses = Counter()
+        rows = conn.execute(f"SELECT {company}, {role}, s.missing_skills {new_scans} AND s.missing_skills IS NOT NULL", (last, high))
+        for company_name, job_role, missing in rows:
+            for skill in missing.split(", "):
+                misses[(company_name, job_role, skill)] += 1
+        conn.executemany('''INSERT INTO rollup_missing_skills VALUES (?, ?, ?, ?)
+                ON CONFLICT(company_name, job_role, skill) DO UPDATE SET misses = misses + excluded.misses''',
+                         [key + (n,) for key, n in misses.items()])
+
+        conn.execute("UPDATE rollup_state SET last_scan_id = ? WHERE id = 1", (high,))
+        return high - last
+
+def _filters(company_name, job_role):
+    where, params = ["1 = 1"], []
+    if company_name:
+        where.append("company_name = ?")
+        params.append(company_name)
+    if job_role:
+        where.append("job_role = ?")
+        params.append(job_role)
+    return " AND ".join(where), params
+
+def _query(sql, params, columns, db_name):
+    import pandas as pd
+    refresh_rollups(db_name)
+    with session(db_name) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return pd.DataFrame(rows, columns=columns)
+
+def scans_per_day(company_name=None, job_role=None, db_name=DB_NAME):
+    where, params = _filters(company_name, job_role)
+    return _query(f'''SELECT day, SUM(scans), ROUND(SUM(score_sum) / SUM(scans), 2) FROM rollup_daily
+                      WHERE {where} GROUP BY day ORDER BY day''', params, ["Day", "Scans", "Avg Score"], db_name)
+
+def scans_by_company(db_name=DB_NAME):
+    return _query('''SELECT company_name, SUM(scans), ROUND(SUM(score_sum) / SUM(scans), 2) FROM rollup_daily
+                     GROUP BY company_name ORDER BY 2 DESC''', [], ["Company", "Scans", "Avg Score"], db_name)
+
+def scans_by_job_role(company_name=None, db_name=DB_NAME):
+    where, params = _filters(company_name, None)
+    return _query(f'''SELECT job_role, SUM(scans), ROUND(SUM(score_sum) / SUM(scans), 2) FROM rollup_daily
+                      WHERE {where} GROUP BY job_role ORDER BY 2 DESC''', params, ["Job Role", "Scans", "Avg Score"], db_name)
+
+def score_histogram(company_name=None, job_role=None, db_name=DB_NAME):
+    where, params = _filters(company_name, job_role)
+    df = _query(f'''SELECT bucket, SUM(scans) FROM rollup_score_hist
+                    WHERE {where} GROUP BY bucket ORDER BY bucket''', params, ["Bucket", "Scans"], db_name)
+    df["Score Range"] = [f"{b * 10}-{b * 10 + 9 if b < HIST_BUCKETS - 1 else 100}" for b in df["Bucket"]]
+    return df[["Score Range", "Scans"]]
+
+def top_missing_skills(company_name=None, job_role=None, limit=10, db_name=DB_NAME):
+    where, params = _filters(company_name, job_role)
+    return _query(f'''SELECT skill, SUM(misses) FROM rollup_missing_skills
+                      WHERE {where} GROUP BY skill ORDER BY 2 DESC LIMIT ?''', params + [limit], ["Skill", "Candidates Missing It"], db_name)
@@ -1,10 +1,18 @@
 import streamlit as st
-import pandas as pd
 import os
 import tempfile
-from db_handler import login_user, add_user, save_scan_result
+from db_handler import bootstrap, login_user, add_user, save_scan_result
+from analytics import scans_per_day, scans_by_job_role, score_histogram, top_missing_skills
+from candidate_store import save_candidate, search_candidates
 from parser_engine import ResumeParser
-from report_generator import generate_report
+from report_generator import render_report, report_filename, write_report_zip
+from nlp_registry import get_registry
+from resume_cache import ResumeCache
+from session_cache import SessionCorpusCache
+import metrics
+from batch_engine import default_workers, DEFAULT_BATCH_SIZE
+from archive_ingest import ArchiveReader
+from job_queue import enqueue_job, ensure_worker, get_job, list_jobs, job_leaderboard, job_report_entries, job_skill_matrix, job_duplicates, job_rejected, job_result_store, retry_job, POLL_SECONDS
 
 # --- UI CONFIG (Dark/Teal Theme) ---
 st.set_page_config(page_title="TalentSphere AI", page_icon="⚡", layout="wide")
@@ -20,12 +28,39 @@ st.markdown("""
     
 """, unsafe_allow_html=True)
 
-# --- CLOUD-SAFE FILE SAVING ---
-def save_uploaded_file(uploaded_file):
-    # Use tempfile to handle file safely without hardcoded paths
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(uploaded_file.getbuffer())
-        return tmp_file.name
+# --- DATABASE SCHEMA (created / migrated once per server process) ---
+@st.cache_resource
+def init_database():
+    bootstrap()
+    return True
+
+init_database()
+
+# --- SHARED NLP MODEL (spaCy is loaded on first use, not at startup) ---
+nlp_registry = get_registry()
+
+# --- EXTRACTION CACHE (shared across sessions, persisted in SQLite) ---
+@st.cache_resource
+def load_resume_cache():
+    return ResumeCache()
+
+resume_cache = load_resume_cache()
+
+# --- PARSED-CORPUS CACHE (per session, in front of the shared one) ---
+def session_corpus():
+    # Editing the skills input reruns the script; uploads seen before skip extraction and spaCy
+    if 'parsed_corpus' not in st.session_state:
+        st.session_state['parsed_corpus'] = SessionCorpusCache(resume_cache)
+    return st.session_state['parsed_corpus']
+
+# --- METRICS ENDPOINT (optional, one per server process) ---
+@st.cache_resource
+def start_metrics_endpoint(port):
+    metrics.enable()
+    return metrics.serve(port)
+
+if os.environ.get("TALENTSPHERE_METRICS_PORT"):
+    start_metrics_endpoint(int(os.environ["TALENTSPHERE_METRICS_PORT"]))
 
 # --- LOGIN SCREEN ---
 def login_screen():
@@ -77,15 +112,13 @@ def job_seeker_dashboard():
         if not skills.strip():
             st.error("⚠️ Please enter Job Description keywords.")
         else:
-            path = save_uploaded_file(file)
-            parser = ResumeParser(path)
-            parser.extract_contact_details()
+            # Upload buffer goes straight to the parser (no temp file)
+            parser = ResumeParser(file.getbuffer(), nlp_registry, cache=session_corpus())
+            # One fused pass for contact, structure audit and keyword match
+            parser.analyze([s.strip() for s in skills.split(",") if s.strip()], stages=("contact", "audit", "match"))
             parser.auto_extract_skills()
-            parser.match_keywords([s.strip() for s in skills.split(",") if s.strip()])
-            parser.audit_resume()
             parser.generate_roadmap()
             data = parser.parsed_data
-            os.remove(path)
             
             # RESULTS
             st.divider()
@@ -112,35 +145,154 @@ def job_seeker_dashboard():
                 st.markdown("* **Overleaf (For Developers):** [View Gallery](https://www.overleaf.com/gallery/tagged/cv)")
             
             try:
-                pdf = generate_report(file.name, st.session_state['username'], data['match_score'], data['missing_keywords'], data['learning_roadmap'])
-                with open(pdf, "rb") as f:
-                    st.download_button("📥 DOWNLOAD ANALYSIS PDF", f, file_name=pdf)
+                # Rendered in memory, so concurrent users never share a file on disk
+                pdf = render_report(file.name, st.session_state['username'], data['match_score'], data['missing_keywords'], data['learning_roadmap'])
+                st.download_button("📥 DOWNLOAD ANALYSIS PDF", pdf, file_name=report_filename(st.session_state['username']), mime="application/pdf")
             except:
                 st.warning("PDF Report generation failed (check report_generator.py)")
 
+# --- BATCH JOB PANEL (polled while the job runs) ---
+LEADERBOARD_ROWS = 500
+
+# Batch Settings choice -> near-duplicate handling stored with the job (see dedup.py)
+DEDUP_MODES = {"Keep all": None, "Flag in leaderboard": "flag", "Skip repeats": "collapse"}
+
+def show_job(job_id):
+    import pandas as pd
+    from result_store import EXPORT_FORMATS
+    job = get_job(job_id)
+    running = job['status'] in ("queued", "running")
+    if running:
+        st.session_state['polling_job'] = job_id
+    elif st.session_state.get('polling_job') == job_id:
+        # Finished while being polled: rerun the page so polling stops
+        st.session_state['polling_job'] = None
+        st.rerun()
+    # Only the top of the leaderboard is displayed; exports stream the full ranking
+    results = job_leaderboard(job_id, limit=LEADERBOARD_ROWS)
+    st.progress(job['done'] / job['total'] if job['total'] else 1.0, text=f"{job['done']} / {job['total']} resumes ranked")
+
+    if job['status'] == "failed":
+        st.error(f"Job failed: {job['error']}")
+        if st.button("🔁 Resume Job"):
+            retry_job(job_id)
+            ensure_worker()
+            st.rerun()
+    rejected = job_rejected(job_id)
+    if rejected:
+        with st.expander(f"⚠️ {len(rejected)} files skipped"):
+            st.dataframe(pd.DataFrame(rejected, columns=["File", "Reason"]), hide_index=True)
+    duplicates = job_duplicates(job_id) if job['dedup'] == "collapse" else []
+    if duplicates:
+        with st.expander(f"🧬 {len(duplicates)} near-duplicate resumes skipped"):
+            st.dataframe(pd.DataFrame(duplicates, columns=["Resume", "Duplicate Of"]), hide_index=True)
+    if not results:
+        st.info("⏳ Waiting for the worker...")
+        return
+
+    # 1. Sort Data (the queue already returns the best candidates first)
+    df = pd.DataFrame(results)
+
+    # 2. Add a 'Rank' column starting at 1
+    df.insert(0, 'Rank', range(1, 1 + len(df)))
+
+    if job['status'] == "done":
+        st.success("✅ Analysis Complete")
+    st.subheader("🏆 Leaderboard")
+
+    # 3. Display with 'Rank' as the index (hides the 0, 1, 2... default index)
+    st.dataframe(df.set_index('Rank'))
+    if len(df) == LEADERBOARD_ROWS:
+        st.caption(f"Showing the top {LEADERBOARD_ROWS} candidates; export the ranking for everyone.")
+
+    if job['status'] == "done":
+        e1, e2 = st.columns([1, 2])
+        fmt = e1.selectbox("Export Format", list(EXPORT_FORMATS), format_func=str.upper, label_visibility="collapsed")
+        if e2.button("📄 Prepare Ranking Export"):
+            with st.spinner("Exporting ranking..."):
+                # Columnar store -> chunked writer: no DataFrame or full CSV string in memory
+                export = job_result_store(job_id).export(fmt, tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024))
+                export.seek(0)
+            st.download_button(f"📥 Download Ranking {fmt.upper()}", export, f"ranking_{job_id}.{fmt}", EXPORT_FORMATS[fmt], on_click="ignore")
+        if st.button("📦 Prepare All Reports (ZIP)"):
+            with st.spinner("Rendering reports..."):
+                # Spills to disk past 32MB instead of holding a huge archive in memory
+                archive = write_report_zip(job_report_entries(job_id), tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024))
+                archive.seek(0)
+            st.download_button("📥 Download Reports ZIP", archive, f"reports_{job_id}.zip", "application/zip", on_click="ignore")
+        rerank_panel(job)
+
+# --- RE-RANKING (skill matrix of a finished job, shared across sessions) ---
+@st.cache_resource(max_entries=8)
+def load_skill_matrix(job_id):
+    return job_skill_matrix(job_id)
+
+@st.cache_resource(show_spinner="Loading NLP model...")
+def load_relevance_index():
+    from relevance import RelevanceIndex
+    # Grows incrementally with the talent pool (see RelevanceIndex.refresh_from_store)
+    return RelevanceIndex(nlp_registry.warmup())
+
+def rerank_panel(job):
+    import pandas as pd
+    with st.expander("🎚️ Re-rank Without Re-parsing"):
+        matrix = load_skill_matrix(job['id'])
+        if not len(matrix):
+            st.info("No skill data stored for this job.")
+            return
+        defaults = [matrix.vocab[i] for i in dict.fromkeys(matrix.columns(job['keywords']))]
+        skills = st.multiselect("Skills", matrix.vocab, default=defaults, key=f"rr_skills_{job['id']}")
+        must = st.multiselect("Must-Have Skills", skills, key=f"rr_must_{job['id']}")
+        cols = st.columns(4)
+        weights = {s: cols[i % 4].slider(s, 0.0, 5.0, 1.0, 0.5, key=f"rr_w_{job['id']}_{s}") for i, s in enumerate(skills)}
+        c1, c2, c3 = st.columns(3)
+        bonus = c1.number_input("Experience Bonus (pts / yr)", 0.0, 10.0, 0.0, 0.5, key=f"rr_bonus_{job['id']}")
+        cap = c2.number_input("Experience Cap (Yrs)", 0.0, 50.0, 10.0, 1.0, key=f"rr_cap_{job['id']}")
+        k = c3.number_input("Show Top", 1, len(matrix), min(100, len(matrix)), key=f"rr_k_{job['id']}")
+
+        # Optional second signal: BM25 relevance of each resume to the full job description
+        jd = st.text_area("Full Job Description (optional, adds a Relevance score)", key=f"rr_jd_{job['id']}")
+        relevance, blend = None, 0.0
+        if jd.strip():
+            index = load_relevance_index()
+            index.refresh_from_store()
+            relevance = index.relevance(jd, matrix.ids)
+            blend = st.slider("Relevance Weight", 0.0, 1.0, 0.5, 0.05, key=f"rr_blend_{job['id']}")
+
+        # Matrix-vector product + argpartition: milliseconds even for 10k candidates
+        ranked = pd.DataFrame(matrix.leaderboard(weights, must, bonus, cap, k, relevance, blend))
+        if ranked.empty:
+            st.info("No candidate has all the must-have skills.")
+            return
+        ranked.insert(0, 'Rank', range(1, 1 + len(ranked)))
+        st.dataframe(ranked.set_index('Rank'))
+
 # --- RECRUITER DASHBOARD ---
 def recruiter_dashboard():
+    import pandas as pd  # only the dashboards need it, not the login screen
     st.sidebar.markdown(f"## 🏢 {st.session_state['user']['company_name']}")
     if st.sidebar.button("LOGOUT"): st.session_state['logged_in'] = False; st.rerun()
         
     st.title("🏆 Candidate Analysis")
     
-    mode = st.radio("Select Mode:", ["👤 Single Profile Analysis", "👥 Batch Ranking"], horizontal=True)
+    modes = ["👤 Single Profile Analysis", "👥 Batch Ranking", "🗄️ Talent Pool", "📊 Hiring Analytics"]
+    if st.session_state['username'] == "admin": modes.append("📈 Pipeline Metrics")
+    mode = st.radio("Select Mode:", modes, horizontal=True)
+    job_role = st.text_input("Job Role", "General")
     target_skills = st.text_area("Required Skills (comma-separated)", "Python, React, AWS")
     req_skills = [s.strip() for s in target_skills.split(",") if s.strip()]
 
     if mode == "👤 Single Profile Analysis":
         file = st.file_uploader("Upload Candidate Resume", type=["pdf"])
         if file and st.button("ANALYZE CANDIDATE"):
-            path = save_uploaded_file(file)
-            parser = ResumeParser(path)
-            parser.extract_contact_details()
-            parser.extract_experience()
+            # Upload buffer goes straight to the parser (no temp file)
+            parser = ResumeParser(file.getbuffer(), nlp_registry, cache=session_corpus())
+            parser.analyze(req_skills, stages=("contact", "experience", "match"))
             parser.auto_extract_skills()
-            parser.match_keywords(req_skills)
             parser.generate_interview_questions()
             data = parser.parsed_data
-            os.remove(path)
+            save_candidate(file.name, parser, st.session_state['user']['company_name'])
+            save_scan_result(st.session_state['username'], job_role, data['match_score'], file.name, data['missing_keywords'])
             
             st.divider()
             c1, c2, c3 = st.columns(3)
@@ -186,52 +338,109 @@ def recruiter_dashboard():
 
             # PDF Report
             try:
-                pdf = generate_report(file.name, data['contact_info']['email'], data['match_score'], data['missing_keywords'], [])
-                with open(pdf, "rb") as f:
-                    st.download_button("📥 Download Report PDF", f, file_name=pdf)
+                pdf = render_report(file.name, data['contact_info']['email'], data['match_score'], data['missing_keywords'], [])
+                st.download_button("📥 Download Report PDF", pdf, file_name=report_filename(data['contact_info']['email']), mime="application/pdf")
             except:
                 st.warning("Report generation skipped.")
 
     elif mode == "👥 Batch Ranking":
-        files = st.file_uploader("Upload Multiple Resumes", type=["pdf"], accept_multiple_files=True)
+        bulk = st.radio("Upload", ["PDF files", "One ZIP / tar archive (bulk)"], horizontal=True) != "PDF files"
+        if bulk:
+            # Members are decompressed one at a time straight into the queue, never all at once
+            files = st.file_uploader("Upload Resume Archive", type=["zip", "tar", "gz", "tgz", "bz2", "xz"])
+        else:
+            files = st.file_uploader("Upload Multiple Resumes", type=["pdf"], accept_multiple_files=True)
+        with st.expander("⚙️ Batch Settings"):
+            b1, b2 = st.columns(2)
+            workers = b1.number_input("Worker Processes", 1, 64, default_workers())
+            batch_size = b2.number_input("Scoring Batch Size", 1, 512, DEFAULT_BATCH_SIZE)
+            d1, d2 = st.columns(2)
+            dedup = DEDUP_MODES[d1.selectbox("Near-Duplicate Resumes", list(DEDUP_MODES))]
+            dedup_threshold = d2.slider("Duplicate Similarity", 0.5, 1.0, 0.9, 0.01, disabled=dedup is None)
         if files and st.button("RANK CANDIDATES"):
-            results = []
-            progress = st.progress(0)
-            
-            for i, file in enumerate(files):
-                path = save_uploaded_file(file)
-                parser = ResumeParser(path)
-                parser.extract_contact_details()
-                parser.extract_experience()
-                parser.auto_extract_skills()
-                parser.match_keywords(req_skills)
-                data = parser.parsed_data
-                
-                results.append({
-                    "Name": file.name,
-                    "Score": data['match_score'],
-                    "Experience (Yrs)": data['years_experience'],
-                    "Email": data['contact_info']['email'],
-                    "Phone": data['contact_info']['phone'],
-                    "Skills": ", ".join(data['skills_found'])
-                })
-                os.remove(path)
-                progress.progress((i+1)/len(files))
-            
-            # 1. Sort Data
-            df = pd.DataFrame(results).sort_values(by=["Score", "Experience (Yrs)"], ascending=False)
-            
-            # 2. Add a 'Rank' column starting at 1
-            df.insert(0, 'Rank', range(1, 1 + len(df)))
-            
-            st.success("✅ Analysis Complete")
-            st.subheader("🏆 Leaderboard")
-            
-            # 3. Display with 'Rank' as the index (hides the 0, 1, 2... default index)
-            st.dataframe(df.set_index('Rank'))
-            
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button("📥 Download Ranking CSV", csv, "ranking.csv", "text/csv")
+            # The ranking itself runs in the background worker, so reruns and disconnects don't lose work
+            if bulk:
+                uploads = ArchiveReader(files)
+                rejected = uploads.errors
+            else:
+                uploads = ((file.name, file.getbuffer()) for file in files)
+                rejected = ()
+            try:
+                with st.spinner("Storing resumes..."):
+                    st.session_state['batch_job'] = enqueue_job(st.session_state['username'], st.session_state['user']['company_name'],
+                                                                job_role, req_skills, uploads, workers=workers, batch_size=batch_size,
+                                                                dedup=dedup, dedup_threshold=dedup_threshold, rejected=rejected)
+                ensure_worker()
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+        jobs = list_jobs(st.session_state['username'])
+        if jobs:
+            job_ids = [job['id'] for job in jobs]
+            current = st.session_state.get('batch_job', job_ids[0])
+            job_id = st.selectbox("Ranking Job", job_ids, index=job_ids.index(current) if current in job_ids else 0,
+                                  format_func=lambda i: next(f"#{j['id']} · {j['job_role']} · {j['total']} resumes · {j['status']}" for j in jobs if j['id'] == i))
+            job = next(j for j in jobs if j['id'] == job_id)
+            if job['status'] in ("queued", "running"):
+                # Picks interrupted jobs back up if no worker is alive (e.g. after a server restart)
+                ensure_worker()
+            st.fragment(run_every=POLL_SECONDS if job['status'] in ("queued", "running") else None)(show_job)(job_id)
+    elif mode == "🗄️ Talent Pool":
+        # Searches previously analysed candidates without re-parsing any PDF
+        c1, c2 = st.columns([2, 1])
+        text_query = c1.text_input("Full-Text Search (optional)", "")
+        min_years = c2.number_input("Minimum Experience (Yrs)", 0.0, 50.0, 0.0, step=0.5)
+        if st.button("SEARCH TALENT POOL"):
+            matches = search_candidates(st.session_state['user']['company_name'], req_skills, min_years, text_query.strip() or None)
+            if matches:
+                st.success(f"✅ {len(matches)} stored candidates match ALL required skills")
+                st.dataframe(pd.DataFrame(matches).set_index('ID'))
+            else:
+                st.warning("No stored candidates match these criteria.")
+
+    elif mode == "📊 Hiring Analytics":
+        # Charts read the pre-aggregated rollup tables, never the raw scans
+        company = st.session_state['user']['company_name']
+        roles = scans_by_job_role(company)
+        if roles.empty:
+            st.info("No scans recorded yet. Analyse some candidates first.")
+        else:
+            role = st.selectbox("Job Role", ["All Roles"] + list(roles["Job Role"]))
+            role = None if role == "All Roles" else role
+            c1, c2 = st.columns(2)
+            with c1:
+                st.subheader("📈 Scans per Day")
+                st.line_chart(scans_per_day(company, role).set_index("Day")["Scans"])
+            with c2:
+                st.subheader("🎯 Score Distribution")
+                st.bar_chart(score_histogram(company, role).set_index("Score Range"))
+            c3, c4 = st.columns(2)
+            with c3:
+                st.subheader("🧩 Top Missing Skills")
+                st.bar_chart(top_missing_skills(company, role).set_index("Skill"))
+            with c4:
+                st.subheader("💼 By Job Role")
+                st.dataframe(roles.set_index("Job Role"))
+
+    elif mode == "📈 Pipeline Metrics":
+        # Admin-only view of this server process's stage timings
+        enabled = st.toggle("Record pipeline metrics", value=metrics.ENABLED)
+        if enabled != metrics.ENABLED:
+            metrics.enable(enabled)
+        rows = metrics.REGISTRY.summary()
+        if not rows:
+            st.info("No samples yet. Enable recording and run some analyses.")
+        else:
+            st.dataframe(pd.DataFrame(rows).set_index("Stage"))
+            stage = st.selectbox("Latency Histogram", [r["Stage"] for r in rows])
+            recent_ms = pd.Series([v * 1000 for v in metrics.REGISTRY.latency[stage].recent], name="ms")
+            buckets = pd.cut(recent_ms, bins=min(20, max(1, len(recent_ms)))).value_counts(sort=False)
+            st.bar_chart(pd.Series(buckets.values, index=[f"{b.left:.1f}-{b.right:.1f} ms" for b in buckets.index]))
+        c1, c2 = st.columns(2)
+        c1.download_button("📥 Prometheus Metrics", metrics.REGISTRY.render_prometheus(), "talentsphere.prom", "text/plain")
+        if c2.button("RESET METRICS"):
+            metrics.REGISTRY.reset()
+            st.rerun()
 
 # --- MAIN ---
 if 'logged_in' not in st.session_state: st.session_state['logged_in'] = False
@@ -0,0 +1,166 @@
+"""
+Bulk ingest of resume archives (ZIP or tar, optionally gzip/bz2/xz compressed).
+
+Members are decompressed one at a time and handed to the pipeline as bytes, so memory
+holds the archive index plus a single resume, however large the archive is.
+Members that are not PDFs, too large, encrypted or corrupt are skipped and reported
+per member; they never abort the batch.
+
+    reader = ArchiveReader(upload)
+    rank_resumes(reader, keywords)     # or enqueue_job(..., reader, rejected=reader.errors)
+    reader.errors                      # [(member name, reason), ...]
+"""
+import logging
+import os
+import tarfile
+import zipfile
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# --- INGEST BUDGETS ---
+MAX_MEMBER_BYTES = 10 * 1024 * 1024     # uncompressed size of one resume
+MAX_MEMBERS = 5000                      # PDFs taken from one archive
+MAX_TOTAL_BYTES = 2 * 1024 * 1024 * 1024
+PDF_MAGIC = b"%PDF-"
+
+# Archive tool litter (macOS resource forks, dotfiles) is skipped silently
+IGNORED_PREFIXES = ("__MACOSX/",)
+
+# Per-member read failures: corrupt data, bad CRC, encryption, unsupported compression
+MEMBER_ERRORS = (zipfile.BadZipFile, tarfile.TarError, zlib.error, RuntimeError, NotImplementedError, OSError, EOFError)
+
+def is_archive(path):
+    """True for ZIP and tar files (tar.gz, tgz, ...) on disk."""
+    return os.path.isfile(path) and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path))
+
+def _ignored(name):
+    return name.startswith(IGNORED_PREFIXES) or os.path.basename(name).startswith(".")
+
+def _mb(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+class ArchiveReader:
+    """
+    Iterates the PDF members of a ZIP or tar archive as (name, pdf_bytes), one at a time.
+
+    `source` is a path or a binary file object (a Streamlit upload works as-is).
+    Skipped members are collected in `errors` as (member name, reason) while iterating.
+    """
+
+    def __init__(self, source, max_member_bytes=MAX_MEMBER_BYTES, max_members=MAX_MEMBERS, max_total_bytes=MAX_TOTAL_BYTES):
+        self.source = source
+        self.max_member_bytes = max_member_bytes
+        self.max_members = max_members
+        self.max_total_bytes = max_total_bytes
+        self.errors = []
+        self.accepted = 0
+        self.total_bytes = 0
+
+    def __iter__(self):
+        self.errors.clear()
+        self.accepted = self.total_bytes = 0
+        fileobj = open(self.source, "rb") if isinstance(self.source, (str, os.PathLike)) else self.source
+        try:
+            fileobj.seek(0)
+            if zipfile.is_zipfile(fileobj):
+                fileobj.seek(0)
+                yield from self._iter_zip(fileobj)
+            else:
+                fileobj.seek(0)
+                yield from self._iter_tar(fileobj)
+        finally:
+            if fileobj is not self.source:
+                fileobj.close()
+
+    def _skip(self, name, reason):
+        logger.warning("Skipping %s: %s", name, reason)
+        self.errors.append((name, reason))
+
+    def _precheck(self, name, size):
+        """Reason to skip a member before reading it, or None."""
+        if not name.lower().endswith(".pdf"):
+            return "not a PDF"
+        if size > self.max_member_bytes:
+            return f"{_mb(size)} exceeds the {_mb(self.max_member_bytes)} per-file limit"
+        return None
+
+    def _accept(self, name, data):
+        """Validates a member's bytes; returns True if it should be yielded."""
+        if len(data) > self.max_member_bytes:
+            # Declared size lied (or was unknown): only limit + 1 bytes were read
+            self._skip(name, f"exceeds the {_mb(self.max_member_bytes)} per-file limit")
+            return False
+        if PDF_MAGIC not in data[:1024]:
+            self._skip(name, "not a PDF (no PDF header)")
+            return False
+        self.accepted += 1
+        self.total_bytes += len(data)
+        return True
+
+    def _budget_left(self):
+        """False once the archive's member or byte budget is used up (reported once)."""
+        if self.accepted >= self.max_members:
+            self._skip("(rest of archive)", f"more than {self.max_members} PDFs; remaining members skipped")
+            return False
+        if self.total_bytes >= self.max_total_bytes:
+            self._skip("(rest of archive)", f"over {_mb(self.max_total_bytes)} in total; remaining members skipped")
+            return False
+        return True
+
+    def _iter_zip(self, fileobj):
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise ValueError(f"Unreadable ZIP archive: {e}") from e
+        with archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or _ignored(name):
+                    continue
+                reason = self._precheck(name, info.file_size)
+                if reason:
+                    self._skip(name, reason)
+                    continue
+                if not self._budget_left():
+                    return
+                try:
+                    with archive.open(info) as member:
+                        data = member.read(self.max_member_bytes + 1)
+                except MEMBER_ERRORS as e:
+                    self._skip(name, f"unreadable ({e})")
+                    continue
+                if self._accept(name, data):
+                    yield name, data
+
+    def _iter_tar(self, fileobj):
+        try:
+            # Stream mode: members are read in order, nothing is seeked back to
+            archive = tarfile.open(fileobj=fileobj, mode="r|*")
+        except tarfile.TarError as e:
+            raise ValueError("Not a ZIP or tar archive") from e
+        with archive:
+            try:
+                for info in archive:
+                    name = info.name
+                    if info.isdir() or _ignored(name):
+                        continue
+                    if not info.isfile():
+                        self._skip(name, "not a regular file")
+                        continue
+                    reason = self._precheck(name, info.size)
+                    if reason:
+                        self._skip(name, reason)
+                        continue
+                    if not self._budget_left():
+                        return
+                    try:
+                        data = archive.extractfile(info).read(self.max_member_bytes + 1)
+                    except MEMBER_ERRORS as e:
+                        self._skip(name, f"unreadable ({e})")
+                        continue
+                    if self._accept(name, data):
+                        yield name, data
+            except MEMBER_ERRORS as e:
+                # A truncated or corrupt tar can't be read past the damage
+                self._skip("(rest of archive)", f"archive is damaged ({e}); remaining members skipped")
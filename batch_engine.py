@@ -0,0 +1,140 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from resume_loader import extract_text_from_pdf, read_pdf_bytes
+from parser_engine import ResumeParser
+from nlp_registry import get_registry
+from nlp_service import find_skills
+from resume_cache import ResumeCache
+
+# --- CONFIG ---
+DEFAULT_BATCH_SIZE = 32
+# Bulk ingest only: generous enough for any real CV, but a 500-page portfolio in an archive can't blow up memory
+EXTRACT_BUDGETS = {"max_pages": 40, "max_chars": 200_000}
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+def _extract_text(source):
+    """Runs inside a worker process: PDF -> normalised text."""
+    try:
+        return extract_text_from_pdf(source, **EXTRACT_BUDGETS)
+    except Exception:
+        return ""
+
+def _analyze(parser, keywords):
+    parser.analyze(keywords, stages=("contact", "experience", "match"))
+    parser.auto_extract_skills()
+    return parser
+
+def _score_chunk(chunk, keywords, registry, cache, dedup=None):
+    """Scores a chunk of extracted texts (skills come from one taxonomy trie walk per resume)."""
+    if dedup is not None:
+        # One vectorised MinHash pass for the whole chunk
+        for (name, _, _), sig in zip(chunk, dedup.signatures_for([text for _, _, text in chunk])):
+            dedup.add_signature(name, sig)
+    # One round trip to the shared NLP service for the whole chunk (None: matched in-process)
+    skills = find_skills(text for _, _, text in chunk) or [None] * len(chunk)
+    for (name, digest, text), skill_ids in zip(chunk, skills):
+        original = dedup.duplicates.get(name) if dedup is not None else None
+        if original is not None and dedup.collapse:
+            yield name, None
+            continue
+        parser = ResumeParser(name, registry, text=text, cache=cache, content_hash=digest, skill_ids=skill_ids)
+        parser.parsed_data["duplicate_of"] = original
+        yield name, _analyze(parser, keywords)
+
+def _lookup(files, cache, registry, keywords, dedup=None):
+    """
+    Splits inputs into cache hits (scored right away, no fitz/spaCy)
+    and misses that still need extraction: (name, source, digest).
+    When collapsing duplicates, byte-identical repeats are dropped here, before extraction.
+    """
+    for name, source in files:
+        if cache is None and dedup is None:
+            yield None, (name, source, None)
+            continue
+        source = read_pdf_bytes(source)
+        digest = ResumeCache.key(source)
+        if dedup is not None and dedup.collapse and dedup.add_digest(name, digest) is not None:
+            yield (name, None), None
+            continue
+        entry = cache.get(digest) if cache is not None else None
+        if not entry:
+            yield None, (name, source, digest)
+            continue
+        original = dedup.add(name, entry["text"]) if dedup is not None else None
+        if original is not None and dedup.collapse:
+            yield (name, None), None
+            continue
+        parser = ResumeParser.from_cache_entry(name, entry, registry)
+        parser.parsed_data["duplicate_of"] = original
+        yield (name, _analyze(parser, keywords)), None
+
+def rank_resumes(files, keywords, workers=None, batch_size=DEFAULT_BATCH_SIZE, registry=None, cache=None, dedup=None,
+                 max_in_flight=None):
+    """
+    Batch engine for ranking many resumes.
+
+    `files` is an iterable of (name, source) pairs, where source is a path or the PDF bytes.
+    PDF extraction is fanned out to a process pool; extracted texts are scored `batch_size` at a time.
+    At most `max_in_flight` PDFs (default: two per worker) are read from `files` and not yet extracted,
+    so a lazy iterable (e.g. an ArchiveReader) is consumed at the pace of the workers;
+    extracted texts wait until `batch_size` of them (or the last few) can be scored together.
+    With a ResumeCache, previously seen PDFs are answered straight from the cache.
+    With a DedupIndex, near-duplicates of an earlier resume are detected before scoring:
+    flagged in parsed_data["duplicate_of"], or, in collapse mode, yielded as (name, None) unscored.
+    Yields (name, parser) per candidate as soon as it is scored, in completion order.
+    """
+    registry = registry if registry is not None else get_registry()
+    workers = workers or default_workers()
+    todo = _lookup(files, cache, registry, keywords, dedup)
+
+    # Small jobs are not worth spawning a pool for
+    if workers == 1:
+        chunk = []
+        for hit, miss in todo:
+            if hit:
+                yield hit
+                continue
+            name, source, digest = miss
+            chunk.append((name, digest, _extract_text(source)))
+            if len(chunk) >= batch_size:
+                yield from _score_chunk(chunk, keywords, registry, cache, dedup)
+                chunk = []
+        if chunk:
+            yield from _score_chunk(chunk, keywords, registry, cache, dedup)
+        return
+
+    # Bound the number of submitted files so memory stays flat for huge inputs
+    max_in_flight = max_in_flight or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        ready = []   # extracted, waiting for a full batch
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    hit, miss = next(todo)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if hit:
+                    yield hit
+                    continue
+                name, source, digest = miss
+                # Buffers cannot be pickled; paths and bytes cross the process boundary as-is
+                if isinstance(source, memoryview):
+                    source = source.tobytes()
+                pending[pool.submit(_extract_text, source)] = (name, digest)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            ready.extend(pending.pop(f) + (f.result(),) for f in done)
+            # Only full batches are scored while extraction is still running, so nlp/dedup/service calls really batch
+            while len(ready) >= batch_size:
+                yield from _score_chunk(ready[:batch_size], keywords, registry, cache, dedup)
+                ready = ready[batch_size:]
+        if ready:
+            yield from _score_chunk(ready, keywords, registry, cache, dedup)
@@ -0,0 +1,3 @@
+# benchmarks/
+# Synthetic resume corpus + timing harness for the parsing pipeline.
+# Run: python -m benchmarks.run --help
@@ -0,0 +1,73 @@
+import random
+import fitz  # PyMuPDF
+from skills_db import SKILLS_DB
+
+# --- TEXT MATERIAL ---
+FIRST_NAMES = ["Aarav", "Priya", "Keerthana", "Rahul", "Ananya", "John", "Maria", "Wei", "Fatima", "Lucas"]
+LAST_NAMES = ["Sharma", "S", "Iyer", "Smith", "Garcia", "Chen", "Khan", "Müller", "Okafor", "Rossi"]
+COMPANIES = ["TechGlobal", "Infosys", "Acme Corp", "DataWorks", "CloudNine", "Finverse", "MedAI Labs"]
+ACTIONS = ["Developed", "Led", "Designed", "Implemented", "Optimized", "Deployed", "Managed", "Architected", "Analyzed"]
+OBJECTS = ["a real-time analytics pipeline", "the customer onboarding API", "a recommendation engine",
+           "CI/CD workflows for 40 services", "an internal reporting dashboard", "a fraud detection model",
+           "the mobile checkout flow", "data migration to the cloud"]
+FILLER = ("reduced latency by 35 percent while improving reliability and collaborating with cross-functional "
+          "stakeholders across product design and operations to deliver measurable business outcomes").split()
+
+PAGE_RECT = fitz.Rect(54, 54, 558, 738)
+LINES_PER_PAGE = 48
+LINE_HEIGHT = 14
+
+def _resume_lines(rng, pages, skill_density):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    skills = rng.sample(SKILLS_DB, max(1, int(len(SKILLS_DB) * skill_density)))
+    years = rng.randint(0, 15)
+
+    lines = [
+        name.upper(),
+        f"{handle}@example.com | +91 {rng.randint(6000000000, 9999999999)} | linkedin.com/in/{handle.replace('.', '')}",
+        "",
+        "SUMMARY",
+        f"Engineer with {years}+ years of experience building production systems.",
+        "",
+        "SKILLS",
+    ]
+    for i in range(0, len(skills), 6):
+        lines.append(", ".join(skills[i:i + 6]))
+    lines += ["", "EDUCATION", "B.Tech in Computer Science, 2015 - 2019", "", "EXPERIENCE"]
+
+    # Keep adding roles and projects until the requested page count is filled
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target:
+        lines.append(f"{rng.choice(COMPANIES)} | {rng.randint(1, 6)} years")
+        for _ in range(rng.randint(2, 4)):
+            tech = rng.choice(skills)
+            lines.append(f"- {rng.choice(ACTIONS)} {rng.choice(OBJECTS)} using {tech}; {' '.join(rng.sample(FILLER, 5))}.")
+        if rng.random() < 0.3:
+            lines += ["", "PROJECTS", f"- {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}."]
+        lines.append("")
+    return lines[:target]
+
+def generate_resume_pdf(pages=1, skill_density=0.15, seed=None) -> bytes:
+    """
+    Returns a realistic synthetic resume as PDF bytes.
+    `pages` controls length, `skill_density` the fraction of SKILLS_DB mentioned.
+    """
+    rng = random.Random(seed)
+    lines = _resume_lines(rng, pages, skill_density)
+    doc = fitz.open()
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        page = doc.new_page()
+        for i, line in enumerate(lines[start:start + LINES_PER_PAGE]):
+            page.insert_text((PAGE_RECT.x0, PAGE_RECT.y0 + i * LINE_HEIGHT), line, fontsize=9, fontname="helv")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def generate_corpus(count, pages=(1, 3), skill_density=(0.05, 0.3), seed=0):
+    """Yields (name, pdf_bytes) pairs with page counts and skill densities drawn from the given ranges."""
+    rng = random.Random(seed)
+    for i in range(count):
+        n_pages = rng.randint(*pages)
+        density = rng.uniform(*skill_density)
+        yield f"candidate_{i:05d}.pdf", generate_resume_pdf(n_pages, density, seed=rng.random())
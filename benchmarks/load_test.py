@@ -0,0 +1,433 @@
+"""
+Concurrent-user load test for the Streamlit app.
+
+    python -m benchmarks.load_test --users 20                        # 20 sessions on one app server process
+    python -m benchmarks.load_test --users 20 --processes 4          # 4 server processes, 5 sessions each
+    python -m benchmarks.load_test --users 20 --out benchmarks/load.json
+
+Every simulated recruiter runs the real app.py through Streamlit's AppTest: log in, then per
+iteration analyse one resume and submit a batch ranking, waiting for the background worker to
+finish it. Sessions in one process share st.cache_resource (spaCy, the resume cache) exactly like
+users of one server do. Everything runs against a scratch database in a temporary directory.
+
+Reports p50/p95/p99 latency and throughput per flow, peak RSS per process (app servers and the
+ranking worker) and "database is locked" errors.
+AppTest cannot upload files, so st.file_uploader is swapped for one that returns the generated
+PDFs the harness puts in session state.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.run import peak_rss_mb, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+# --- CONFIG ---
+PASSWORD = "load-test"
+COMPANY = "LoadTest Inc"
+UPLOADS_KEY = "_load_test_uploads"   # session state: uploader label -> [(name, pdf bytes)]
+LOCKED = "database is locked"
+FLOWS = ["page_load", "login", "single_analysis", "batch_submit", "batch_complete", "leaderboard"]
+SAMPLE_SECONDS = 0.5                 # worker RSS sampling interval
+
+class _Upload(io.BytesIO):
+    """What st.file_uploader hands the app: a BytesIO with a name."""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+def _file_uploader(label, *args, accept_multiple_files=False, **kwargs):
+    import streamlit as st
+    files = [_Upload(name, data) for name, data in st.session_state.get(UPLOADS_KEY, {}).get(label, [])]
+    if accept_multiple_files:
+        return files
+    return files[0] if files else None
+
+class SimulatedUser:
+    """One recruiter session driving app.py; latencies and errors go into the shared `stats`."""
+
+    def __init__(self, username, resumes, stats, args):
+        self.username = username
+        self.resumes = resumes   # this user's PDFs, consumed in order
+        self.stats = stats
+        self.args = args
+        self.app = None
+
+    def _next(self, count):
+        taken, self.resumes = self.resumes[:count], self.resumes[count:]
+        return taken
+
+    def _run(self, flow, action):
+        """Runs one script rerun (or any action), records its latency and any app exception."""
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.stats.error(flow, str(e))
+            return False
+        elapsed = time.perf_counter() - start
+        errors = [e.message for e in self.app.exception]
+        for message in errors:
+            self.stats.error(flow, message)
+        if not errors:
+            self.stats.sample(flow, elapsed)
+        return not errors
+
+    def _widget(self, kind, label):
+        for widget in getattr(self.app, kind):
+            if widget.label == label:
+                return widget
+        shown = "; ".join([e.message for e in self.app.exception] + [e.value for e in self.app.error]) or "not rendered"
+        raise LookupError(f"no {kind} {label!r} on the page ({shown})")
+
+    def _click(self, label):
+        self._widget("button", label).click().run()
+
+    def _mode(self, mode):
+        self._widget("radio", "Select Mode:").set_value(mode)
+
+    def login(self):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(APP, default_timeout=self.args.timeout)
+        if not self._run("page_load", self.app.run):
+            return False
+        self.app.text_input(key="l_u").input(self.username)
+        self.app.text_input(key="l_p").input(PASSWORD)
+        if not self._run("login", lambda: self._click("LOGIN")):
+            return False
+        if not self.app.session_state["logged_in"]:
+            self.stats.error("login", "invalid credentials")
+            return False
+        return True
+
+    def single_analysis(self):
+        self._mode("👤 Single Profile Analysis")
+        self.app.session_state[UPLOADS_KEY] = {"Upload Candidate Resume": self._next(1)}
+        self.app.run()
+        return self._run("single_analysis", lambda: self._click("ANALYZE CANDIDATE"))
+
+    def batch_ranking(self):
+        from job_queue import get_job
+        self._mode("👥 Batch Ranking")
+        self.app.session_state[UPLOADS_KEY] = {"Upload Multiple Resumes": self._next(self.args.batch_resumes)}
+        self.app.run()
+        if self.args.batch_workers:
+            self._widget("number_input", "Worker Processes").set_value(self.args.batch_workers)
+        submitted = time.perf_counter()
+        if not self._run("batch_submit", lambda: self._click("RANK CANDIDATES")):
+            return False
+        if "batch_job" not in self.app.session_state:
+            self.stats.error("batch_submit", "; ".join(e.value for e in self.app.error) or "no job was queued")
+            return False
+        job_id = self.app.session_state["batch_job"]
+        self.app.session_state[UPLOADS_KEY] = {}
+
+        # The worker ranks in the background; the page's fragment would poll just like this
+        deadline = submitted + self.args.job_timeout
+        while True:
+            job = get_job(job_id)
+            if job["status"] in ("done", "failed"):
+                break
+            if time.perf_counter() > deadline:
+                self.stats.error("batch_complete", f"job {job_id} not finished after {self.args.job_timeout}s")
+                return False
+            time.sleep(self.args.poll)
+        if job["status"] == "failed":
+            self.stats.error("batch_complete", job["error"] or "job failed")
+            return False
+        self.stats.sample("batch_complete", time.perf_counter() - submitted)
+        self.stats.ranked(job["total"])
+        return self._run("leaderboard", self.app.run)
+
+    def scenario(self, start):
+        start.wait()
+        flow = "login"
+        try:
+            if not self.login():
+                return
+            for _ in range(self.args.iterations):
+                flow = "single_analysis"
+                self.single_analysis()
+                flow = "batch_submit"
+                self.batch_ranking()
+        except Exception as e:
+            # A page that didn't render as expected ends this user's session, not the whole test
+            self.stats.error(flow, f"{type(e).__name__}: {e}")
+
+class Stats:
+    """Thread-safe latency samples and error messages per flow."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {flow: [] for flow in FLOWS}
+        self.errors = {flow: [] for flow in FLOWS}
+        self.resumes_ranked = 0
+
+    def sample(self, flow, seconds):
+        with self._lock:
+            self.latencies[flow].append(seconds)
+
+    def error(self, flow, message):
+        with self._lock:
+            self.errors[flow].append(message)
+
+    def ranked(self, count):
+        with self._lock:
+            self.resumes_ranked += count
+
+def _shared_runtime():
+    """
+    AppTest installs a mock Runtime and a fresh script cache for each script run (and removes the
+    Runtime afterwards), which breaks sessions running side by side. One of each for the whole
+    process, as a real server has one Runtime and compiles app.py once.
+    """
+    from unittest.mock import MagicMock
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    # Compiling in several threads at once also trips CPython's parser ("AST constructor recursion depth mismatch")
+    scripts, compile_script = ScriptCache(), ScriptCache.get_bytecode
+    ScriptCache.get_bytecode = lambda self, script_path: compile_script(scripts, script_path)
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+    # AppTest also toggles this per run; keep it on so overlapping runs don't switch it off mid-script
+    config.set_option("global.appTest", True)
+
+def serve(users, args, workdir):
+    """One app server process: runs the given (username, resumes) sessions concurrently."""
+    import streamlit
+    os.chdir(workdir)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    streamlit.file_uploader = _file_uploader
+    _shared_runtime()
+    # Session state is poked from the harness threads, outside any script run
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+    stats = Stats()
+    start = threading.Barrier(len(users))   # every session starts at once
+    with ThreadPoolExecutor(len(users)) as pool:
+        sessions = [pool.submit(SimulatedUser(name, resumes, stats, args).scenario, start) for name, resumes in users]
+        for s in sessions:
+            s.result()
+    return {"pid": os.getpid(), "users": len(users), "latencies": stats.latencies, "errors": stats.errors,
+            "resumes_ranked": stats.resumes_ranked, "peak_rss_mb": peak_rss_mb()}
+
+# --- WORKER MONITORING (Linux /proc) ---
+
+def _proc_rss_mb(pid):
+    """Peak RSS (VmHWM) of a live process in MB, or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+def _proc_tree(pid):
+    """The process and all its descendants."""
+    pids, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        pids.append(p)
+        try:
+            with open(f"/proc/{p}/task/{p}/children") as f:
+                stack.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+def _worker_pids():
+    import sqlite3
+    from db_handler import session
+    try:
+        with session() as conn:
+            return [pid for (pid,) in conn.execute("SELECT pid FROM job_workers WHERE pid IS NOT NULL")]
+    except sqlite3.Error:
+        return []
+
+class WorkerMonitor(threading.Thread):
+    """Samples the ranking worker (and its scoring processes) for peak RSS while the test runs."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peaks = {}     # pid -> (role, MB)
+        self.pids = set()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def sample(self):
+        for worker in _worker_pids():
+            self.pids.add(worker)
+            for pid in _proc_tree(worker):
+                rss = _proc_rss_mb(pid)
+                if rss is not None:
+                    role = "worker" if pid == worker else "scoring"
+                    self.peaks[pid] = (role, max(rss, self.peaks.get(pid, (role, 0.0))[1]))
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.sample()
+
+def _summary(samples, wall):
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "throughput_per_s": round(len(samples) / wall, 3) if wall else None,
+        "p50_ms": round(percentile(samples, 50) * 1000, 1),
+        "p95_ms": round(percentile(samples, 95) * 1000, 1),
+        "p99_ms": round(percentile(samples, 99) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+def setup(usernames):
+    from db_handler import bootstrap, add_user
+    bootstrap()
+    for name in usernames:
+        add_user(name, PASSWORD, "Recruiter", COMPANY, "General")
+
+def run(args, workdir):
+    usernames = [f"recruiter{i:03d}" for i in range(args.users)]
+    setup(usernames)
+    per_user = args.iterations * (1 + args.batch_resumes)
+    corpus = list(generate_corpus(args.resumes or args.users * per_user, pages=(args.min_pages, args.max_pages), seed=args.seed))
+    # Distinct PDFs per user unless --resumes caps the corpus (then they are reused, and cache hits count)
+    users = [(name, [corpus[(u * per_user + k) % len(corpus)] for k in range(per_user)]) for u, name in enumerate(usernames)]
+    shards = [users[p::args.processes] for p in range(args.processes) if users[p::args.processes]]
+
+    monitor = WorkerMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    # Fresh interpreters, so every process pays its own imports and model load like a real server
+    with ProcessPoolExecutor(len(shards), mp_context=get_context("spawn")) as pool:
+        results = list(pool.map(serve, shards, [args] * len(shards), [workdir] * len(shards)))
+    wall = time.perf_counter() - start
+    monitor.stop()
+
+    latencies = {flow: [s for r in results for s in r["latencies"][flow]] for flow in FLOWS}
+    errors = {flow: [m for r in results for m in r["errors"][flow]] for flow in FLOWS}
+    messages = [m for ms in errors.values() for m in ms]
+    log = os.path.join(workdir, "talentsphere_worker.log")
+    worker_locked = 0
+    if os.path.exists(log):
+        with open(log, errors="replace") as f:
+            worker_locked = sum(LOCKED in line for line in f)
+    ranked = sum(r["resumes_ranked"] for r in results)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "users": args.users,
+            "processes": len(shards),
+            "iterations": args.iterations,
+            "batch_resumes": args.batch_resumes,
+            "batch_workers": args.batch_workers,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "wall_seconds": round(wall, 2),
+        "resumes_ranked_per_s": round(ranked / wall, 2) if wall else None,
+        "flows": {flow: {**_summary(latencies[flow], wall), "errors": len(errors[flow])} for flow in FLOWS},
+        "db_lock_errors": {"app": sum(LOCKED in m for m in messages), "worker": worker_locked},
+        "error_samples": sorted(set(messages))[:10],
+        "processes": [{"role": "app", "pid": r["pid"], "users": r["users"], "peak_rss_mb": r["peak_rss_mb"]} for r in results]
+                     + [{"role": role, "pid": pid, "peak_rss_mb": rss} for pid, (role, rss) in sorted(monitor.peaks.items())],
+    }, monitor.pids
+
+def _stop_workers(pids):
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+def report(result):
+    print(f"\n{'flow':18} {'count':>6} {'errors':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>8}")
+    for flow, s in result["flows"].items():
+        if s["count"]:
+            print(f"{flow:18} {s['count']:>6} {s['errors']:>6} {s['p50_ms']:>10.1f} {s['p95_ms']:>10.1f} {s['p99_ms']:>10.1f} {s['throughput_per_s']:>8.3f}")
+        else:
+            print(f"{flow:18} {0:>6} {s['errors']:>6}")
+    print(f"\n{result['resumes_ranked_per_s']} resumes ranked/s over {result['wall_seconds']}s")
+    locked = result["db_lock_errors"]
+    print(f"DB lock errors: {locked['app']} in the app, {locked['worker']} in the worker log")
+    for p in result["processes"]:
+        print(f"{p['role']:8} pid {p['pid']:<8} peak RSS {p['peak_rss_mb']} MB")
+    for message in result["error_samples"]:
+        print(f"⚠️ {message}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the TalentSphere app with concurrent simulated recruiters.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--processes", type=int, default=1, help="app server processes the sessions are spread over")
+    parser.add_argument("--iterations", type=int, default=1, help="single analyses + batch rankings per user")
+    parser.add_argument("--batch-resumes", type=int, default=10, help="PDFs per batch ranking")
+    parser.add_argument("--batch-workers", type=int, default=None, help="'Worker Processes' setting (default: the app's)")
+    parser.add_argument("--resumes", type=int, default=None, help="corpus size (default: distinct PDFs for every upload)")
+    parser.add_argument("--min-pages", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds one script rerun may take")
+    parser.add_argument("--job-timeout", type=float, default=600, help="seconds to wait for a batch job")
+    parser.add_argument("--poll", type=float, default=0.25, help="job status polling interval")
+    parser.add_argument("--workdir", help="keep the scratch database here (default: a temporary directory)")
+    parser.add_argument("--out", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out) if args.out else None
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="talentsphere-load-")
+    os.makedirs(workdir, exist_ok=True)
+    cwd = os.getcwd()
+    # The scratch database (and the worker's log) are relative paths, resolved here
+    os.chdir(workdir)
+    workers = set()
+    try:
+        result, workers = run(args, workdir)
+    finally:
+        # The app starts a detached worker in the scratch directory; it must not outlive the test
+        _stop_workers(workers | set(_worker_pids()))
+        os.chdir(cwd)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report(result)
+    if out:
+        with open(out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved results to {out}")
+    failed = sum(s["errors"] for s in result["flows"].values())
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Benchmark suite for the TalentSphere parsing pipeline.
+
+    python -m benchmarks.run                                 # print results
+    python -m benchmarks.run --out benchmarks/baseline.json  # record a baseline
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Every benchmark reports throughput, p50/p95 latency and peak RSS.
+With --compare, any p95 regression beyond --tolerance makes the run exit non-zero.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+
+from benchmarks.corpus import generate_corpus
+from resume_loader import extract_text_from_pdf
+from parser_engine import ResumeParser
+from batch_engine import rank_resumes, DEFAULT_BATCH_SIZE
+from nlp_registry import get_registry
+from report_generator import render_report, write_report_zip
+
+KEYWORDS = ["Python", "SQL", "AWS", "React", "Docker", "Machine Learning", "Java", "Kubernetes"]
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its (finished) children, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max(own, children) / scale, 1)
+
+def percentile(samples, q):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+def summarize(latencies, total_seconds, items=None):
+    items = items if items is not None else len(latencies)
+    return {
+        "items": items,
+        "throughput_per_s": round(items / total_seconds, 2) if total_seconds else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def time_each(func, inputs):
+    latencies = []
+    start = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+def bench_extraction(corpus):
+    return time_each(lambda item: extract_text_from_pdf(item[1]), corpus)
+
+def bench_parser_stages(corpus):
+    registry = get_registry().warmup()
+    texts = [(name, extract_text_from_pdf(data)) for name, data in corpus]
+    stages = {
+        "contact": lambda p: p.analyze(stages=("contact",)),
+        "experience": lambda p: p.analyze(stages=("experience",)),
+        "audit": lambda p: p.analyze(stages=("audit",)),
+        "match": lambda p: p.analyze(KEYWORDS, stages=("match",)),
+        "analyze_all": lambda p: p.analyze(KEYWORDS),
+        "auto_extract_skills": lambda p: p.auto_extract_skills(),
+        "interview_questions": lambda p: p.generate_interview_questions(),
+    }
+    # Questions are built from the matched skills, so that stage starts from a matched parser (untimed)
+    setup = {"interview_questions": lambda p: p.analyze(KEYWORDS, stages=("match",))}
+    results = {}
+    for name, func in stages.items():
+        # Fresh parsers per stage: skill IDs are memoised, so a shared parser would time a cache hit
+        parsers = [ResumeParser(filename, registry, text=text) for filename, text in texts]
+        for p in parsers:
+            setup.get(name, lambda p: None)(p)
+        results[f"parser.{name}"] = time_each(func, parsers)
+    return results
+
+def bench_batch(corpus, workers, batch_size):
+    latencies = []
+    start = last = time.perf_counter()
+    # Latency here is the gap between consecutive results as they stream out
+    for _ in rank_resumes(corpus, KEYWORDS, workers=workers, batch_size=batch_size):
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+    return summarize(latencies, time.perf_counter() - start)
+
+def bench_report(n):
+    missing = ["Kubernetes", "Terraform", "Go"]
+    roadmap = [f"**Learn {s}:** [View Courses](https://www.coursera.org/search?query={s})" for s in missing]
+    return time_each(lambda i: render_report(f"candidate_{i}.pdf", f"user{i}@example.com", 62.5, missing, roadmap), range(n))
+
+def bench_report_zip(n, workers):
+    entries = [(f"{i:04d}.pdf", (f"candidate_{i}.pdf", f"user{i}@example.com", 62.5, ["Go"], [])) for i in range(n)]
+    start = time.perf_counter()
+    write_report_zip(entries, io.BytesIO(), workers)
+    elapsed = time.perf_counter() - start
+    return summarize([elapsed], elapsed, items=n)
+
+def run(args):
+    corpus = list(generate_corpus(args.resumes, pages=(args.min_pages, args.max_pages),
+                                  skill_density=(args.min_density, args.max_density), seed=args.seed))
+    results = {}
+    results["extract_text_from_pdf"] = bench_extraction(corpus)
+    results.update(bench_parser_stages(corpus))
+    results["batch_ranking"] = bench_batch(corpus, args.workers, args.batch_size)
+    results["render_report"] = bench_report(min(args.resumes, 200))
+    results["report_zip"] = bench_report_zip(args.resumes, args.workers)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "resumes": args.resumes,
+            "pages": [args.min_pages, args.max_pages],
+            "skill_density": [args.min_density, args.max_density],
+            "workers": args.workers,
+            "batch_size": args.batch_size,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+
+def compare(current, baseline, tolerance):
+    """Prints p95 deltas against a baseline; returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':32} {'base p95':>10} {'now p95':>10} {'delta':>8}")
+    for name, now in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            continue
+        delta = (now["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        flag = "  <-- REGRESSION" if delta > tolerance else ""
+        print(f"{name:32} {base['p95_ms']:>10.3f} {now['p95_ms']:>10.3f} {delta:>+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TalentSphere parsing pipeline on a synthetic corpus.")
+    parser.add_argument("--resumes", type=int, default=200, help="number of synthetic resumes")
+    parser.add_argument("--min-pages", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=3)
+    parser.add_argument("--min-density", type=float, default=0.05, help="min fraction of SKILLS_DB mentioned")
+    parser.add_argument("--max-density", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=None, help="batch ranking worker processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    current = run(args)
+    print(json.dumps(current, indent=2))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved results to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Cold-start benchmark: how long importing each entry-point module takes in a fresh interpreter,
+and which heavy dependencies it drags in.
+
+    python -m benchmarks.startup                    # fail if any import takes over 500ms
+    python -m benchmarks.startup --budget-ms 150    # tighter budget
+
+Every module is imported in its own subprocess (median of --repeat runs), so nothing is cached between them.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules a cold start (web app, CLI, worker) imports before doing any work
+MODULES = ["parser_engine", "batch_engine", "db_handler", "analytics", "candidate_store",
+           "report_generator", "job_queue", "talentsphere", "nlp_service"]
+
+# Must only be imported on first use, never by importing the modules above
+HEAVY = ["spacy", "fitz", "fpdf", "pandas"]
+
+BUDGET_MS = 500   # per module, median cold import
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module, repeat):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=root, capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {"median_ms": round(statistics.median(r["ms"] for r in runs), 1), "heavy": runs[-1]["heavy"]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import time of the TalentSphere entry points.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="fail if any module's median import exceeds this")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':20} {'import ms':>10}  heavy deps loaded")
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        over = args.budget_ms is not None and result["median_ms"] > args.budget_ms
+        print(f"{module:20} {result['median_ms']:>10.1f}  {', '.join(result['heavy']) or '-'}{'  <-- OVER BUDGET' if over else ''}")
+        if over:
+            failures.append(module)
+        if result["heavy"]:
+            failures.append(f"{module} (imports {', '.join(result['heavy'])})")
+
+    if failures:
+        print(f"\n{len(failures)} startup check(s) failed: {'; '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
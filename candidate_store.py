@@ -0,0 +1,137 @@
+import hashlib
+from db_handler import DB_NAME, session
+from skills_db import SKILLS_DB
+from skills_taxonomy import get_taxonomy
+
+# Skills from SKILLS_DB are always auto-extracted, so the skill index is authoritative for them.
+# Anything else is answered by the full-text index instead.
+INDEXED_SKILLS = {s.lower() for s in SKILLS_DB}
+
+CANDIDATES_TABLE = '''CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content_hash TEXT,
+        filename TEXT,
+        company_name TEXT,
+        text TEXT,
+        email TEXT,
+        phone TEXT,
+        years_experience REAL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (content_hash, company_name))'''
+
+def init_store(db_name=DB_NAME):
+    with session(db_name) as conn:
+        _create_schema(conn.cursor())
+
+def _create_schema(c):
+    # Candidates Table: one row per distinct resume (by content hash) in each company's pool
+    c.execute(CANDIDATES_TABLE.format(name="candidates"))
+    if _hash_unique_across_companies(c):
+        # Older stores keyed candidates by content hash alone, so a second company's upload took the row over.
+        # Rebuild with the per-company key, keeping ids (the FTS index and candidate_skills refer to them).
+        c.execute("ALTER TABLE candidates RENAME TO candidates_old")
+        c.execute(CANDIDATES_TABLE.format(name="candidates"))
+        c.execute("INSERT INTO candidates SELECT * FROM candidates_old")
+        c.execute("DROP TABLE candidates_old")
+
+    # Skill -> Candidate index (lowercased skill names)
+    c.execute('''CREATE TABLE IF NOT EXISTS candidate_skills (
+            skill TEXT,
+            candidate_id INTEGER,
+            PRIMARY KEY (skill, candidate_id)) WITHOUT ROWID''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_candidates_company_exp ON candidates(company_name, years_experience)")
+
+    # Full-text index over the normalised resume text, kept in sync by triggers
+    c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(text, content='candidates', content_rowid='id')")
+    c.execute('''CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN
+            INSERT INTO candidates_fts(rowid, text) VALUES (new.id, new.text); END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN
+            INSERT INTO candidates_fts(candidates_fts, rowid, text) VALUES ('delete', old.id, old.text); END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS candidates_au AFTER UPDATE OF text ON candidates BEGIN
+            INSERT INTO candidates_fts(candidates_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO candidates_fts(rowid, text) VALUES (new.id, new.text); END''')
+
+def _hash_unique_across_companies(c):
+    for _, index, unique, *_ in c.execute("PRAGMA index_list(candidates)").fetchall():
+        if unique and [col[2] for col in c.execute(f"PRAGMA index_info({index})")] == ["content_hash"]:
+            return True
+    return False
+
+def _phrase(text):
+    """Quotes user input as a single FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
+
+def save_candidates(records, company_name, db_name=DB_NAME):
+    """
+    Stores parsed resumes in the corpus (one transaction for the whole list).
+    `records` are (filename, parser) pairs; re-uploads of the same file by the same company update its existing row.
+    """
+    with session(db_name) as conn:
+        insert_candidates(conn.cursor(), records, company_name)
+
+def insert_candidates(c, records, company_name):
+    """Same as save_candidates, on a cursor inside the caller's transaction. Returns the candidate ids (None if skipped)."""
+    ids = []
+    for filename, parser in records:
+        if not parser.raw_text:
+            ids.append(None)
+            continue
+        data = parser.parsed_data
+        content_hash = parser.content_hash or hashlib.sha256(parser.raw_text.encode()).hexdigest()
+        contact = data["contact_info"]
+        c.execute('''INSERT INTO candidates (content_hash, filename, company_name, text, email, phone, years_experience)
+                     VALUES (?, ?, ?, ?, ?, ?, ?)
+                     ON CONFLICT(content_hash, company_name) DO UPDATE SET filename=excluded.filename,
+                         email=excluded.email, phone=excluded.phone, years_experience=excluded.years_experience''',
+                  (content_hash, filename, company_name, parser.raw_text,
+                   contact.get("email"), contact.get("phone"), data["years_experience"]))
+        candidate_id = c.execute("SELECT id FROM candidates WHERE content_hash=? AND company_name=?",
+                                 (content_hash, company_name)).fetchone()[0]
+        # Replace, not merge: skills no longer extracted from this resume drop out of the index
+        c.execute("DELETE FROM candidate_skills WHERE candidate_id=?", (candidate_id,))
+        skills = {s.lower() for s in data["auto_extracted_skills"] + data["skills_found"]}
+        c.executemany("INSERT OR IGNORE INTO candidate_skills VALUES (?, ?)", [(s, candidate_id) for s in skills])
+        ids.append(candidate_id)
+    return ids
+
+def save_candidate(filename, parser, company_name, db_name=DB_NAME):
+    save_candidates([(filename, parser)], company_name, db_name)
+
+def search_candidates(company_name, skills=(), min_years=0, text_query=None, limit=100, db_name=DB_NAME):
+    """
+    Finds stored candidates having ALL `skills` and at least `min_years` of experience,
+    optionally narrowed by a free-text FTS query. No resume is parsed again.
+    """
+    where = ["c.company_name = ?", "c.years_experience >= ?"]
+    params = [company_name, min_years]
+    taxonomy = get_taxonomy()
+    for skill in skills:
+        if not skill.strip():
+            continue
+        # Aliases ("ReactJS", "K8s") search under the canonical skill name
+        sid = taxonomy.resolve(skill)
+        s = taxonomy.name(sid).lower() if sid else skill.strip().lower()
+        if s in INDEXED_SKILLS:
+            where.append("c.id IN (SELECT candidate_id FROM candidate_skills WHERE skill = ?)")
+            params.append(s)
+        else:
+            where.append("c.id IN (SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH ?)")
+            params.append(_phrase(s))
+    if text_query:
+        where.append("c.id IN (SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH ?)")
+        params.append(_phrase(text_query))
+
+    sql = f'''SELECT c.id, c.filename, c.email, c.phone, c.years_experience,
+                     (SELECT group_concat(skill, ', ') FROM candidate_skills WHERE candidate_id = c.id), c.timestamp
+              FROM candidates c
+              WHERE {" AND ".join(where)}
+              ORDER BY c.years_experience DESC, c.id DESC
+              LIMIT ?'''
+    params.append(limit)
+
+    with session(db_name) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [
+        {"ID": r[0], "Name": r[1], "Email": r[2], "Phone": r[3], "Experience (Yrs)": r[4], "Skills": r[5] or "", "Added": r[6]}
+        for r in rows
+    ]
@@ -1,77 +1,161 @@
 import sqlite3
 import hashlib
-import pandas as pd
+import queue
+import threading
+from contextlib import contextmanager
 
 DB_NAME = "talentsphere_final.db"
 
-def init_db():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    # Users Table: Now explicitly stores company_name and company_type
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
-            username TEXT PRIMARY KEY, 
-            password TEXT, 
-            role TEXT, 
-            company_name TEXT, 
-            company_type TEXT)''')
-    
-    # Scans Table
-    c.execute('''CREATE TABLE IF NOT EXISTS scans (
-            id INTEGER PRIMARY KEY AUTOINCREMENT, 
-            user_name TEXT, 
-            job_role TEXT, 
-            score REAL, 
-            filename TEXT, 
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-    
-    # Create Default Admin
-    default_user = "admin"
-    default_pass = hashlib.sha256("admin123".encode()).hexdigest()
-    try:
-        c.execute("INSERT INTO users VALUES (?, ?, ?, ?, ?)", 
+# --- CONNECTION POOL CONFIG ---
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 10000       # wait for a writer instead of failing with "database is locked"
+STATEMENT_CACHE_SIZE = 256    # compiled statements kept per pooled connection
+
+class ConnectionPool:
+    """
+    Small pool of long-lived SQLite connections in WAL mode.
+    Reusing connections also reuses sqlite3's per-connection prepared-statement cache.
+    """
+
+    def __init__(self, db_name, size=POOL_SIZE):
+        self.db_name = db_name
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        # WAL lets readers keep going while one session writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name=DB_NAME):
+    with _pools_lock:
+        if db_name not in _pools:
+            _pools[db_name] = ConnectionPool(db_name)
+        return _pools[db_name]
+
+@contextmanager
+def session(db_name=DB_NAME):
+    """Pooled connection wrapped in a transaction: commits on success, rolls back on error."""
+    with get_pool(db_name).connection() as conn:
+        with conn:
+            yield conn
+
+def init_db(db_name=DB_NAME):
+    with session(db_name) as conn:
+        c = conn.cursor()
+        # Users Table: Now explicitly stores company_name and company_type
+        c.execute('''CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password TEXT,
+                role TEXT,
+                company_name TEXT,
+                company_type TEXT)''')
+
+        # Scans Table
+        c.execute('''CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_name TEXT,
+                job_role TEXT,
+                score REAL,
+                filename TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+        # Older databases predate the missing_skills column (used by analytics)
+        if "missing_skills" not in [col[1] for col in c.execute("PRAGMA table_info(scans)")]:
+            c.execute("ALTER TABLE scans ADD COLUMN missing_skills TEXT")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_scans_user_time ON scans(user_name, timestamp)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_scans_job_role ON scans(job_role)")
+
+        # Create Default Admin
+        default_user = "admin"
+        default_pass = hashlib.sha256("admin123".encode()).hexdigest()
+        c.execute("INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?, ?)",
                   (default_user, default_pass, "Recruiter", "TechGlobal", "MNC"))
-    except sqlite3.IntegrityError:
-        pass 
-    conn.commit()
-    conn.close()
 
 def login_user(username, password):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
     hashed_pass = hashlib.sha256(password.encode()).hexdigest()
-    
+
     # We fetch Company details here so we can use them in the Dashboard
-    c.execute("SELECT role, company_name, company_type FROM users WHERE username=? AND password=?", (username, hashed_pass))
-    result = c.fetchone()
-    conn.close()
-    
-    if result: 
+    with session() as conn:
+        result = conn.execute("SELECT role, company_name, company_type FROM users WHERE username=? AND password=?", (username, hashed_pass)).fetchone()
+
+    if result:
         return {
-            "role": result[0], 
-            "company_name": result[1] if result[1] else "General", 
+            "role": result[0],
+            "company_name": result[1] if result[1] else "General",
             "company_type": result[2] if result[2] else "General"
         }
     return None
 
 def add_user(username, password, role, company_name=None, company_type=None):
     if not username or not password: return False
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
     hashed_pass = hashlib.sha256(password.encode()).hexdigest()
     try:
-        c.execute("INSERT INTO users VALUES (?, ?, ?, ?, ?)", (username, hashed_pass, role, company_name, company_type))
-        conn.commit()
+        with session() as conn:
+            conn.execute("INSERT INTO users VALUES (?, ?, ?, ?, ?)", (username, hashed_pass, role, company_name, company_type))
         return True
-    except:
+    except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
-def save_scan_result(username, job_role, score, filename):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT INTO scans (user_name, job_role, score, filename) VALUES (?, ?, ?, ?)", (username, job_role, score, filename))
-    conn.commit()
-    conn.close()
+def save_scan_result(username, job_role, score, filename, missing_skills=None):
+    save_scan_results([(username, job_role, score, filename, missing_skills)])
+
+def save_scan_results(rows):
+    """
+    Bulk insert of (username, job_role, score, filename[, missing_skills]) rows in a single transaction.
+    missing_skills is a list of skill names (or None).
+    """
+    with session() as conn:
+        insert_scans(conn, rows)
+
+def insert_scans(conn, rows):
+    """Same as save_scan_results, inside the caller's transaction."""
+    params = []
+    for row in rows:
+        missing = row[4] if len(row) > 4 else None
+        params.append(tuple(row[:4]) + (", ".join(missing) if missing else None,))
+    conn.executemany("INSERT INTO scans (user_name, job_role, score, filename, missing_skills) VALUES (?, ?, ?, ?, ?)", params)
+
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+
+def bootstrap(db_name=DB_NAME):
+    """
+    Creates or migrates every table the app uses (users, scans, talent pool, analytics rollups, job queue).
+    Idempotent, and cheap after the first call per process: call it once at startup instead of relying on import side effects.
+    """
+    from candidate_store import init_store
+    from analytics import init_analytics
+    from job_queue import init_jobs
 
-init_db()
\ No newline at end of file
+    with _bootstrap_lock:
+        if db_name in _bootstrapped:
+            return
+        init_db(db_name)
+        init_store(db_name)
+        init_analytics(db_name)
+        init_jobs(db_name)
+        _bootstrapped.add(db_name)
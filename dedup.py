@@ -0,0 +1,259 @@
+"""
+Near-duplicate resume detection: MinHash fingerprints bucketed with LSH.
+
+A resume's normalised text (lowercase words, digits dropped so a changed phone number
+or date barely matters) is cut into overlapping word shingles. Each shingle is hashed
+once and the signature is its one-permutation MinHash (one minimum per bin, empty bins
+filled from their neighbour). Signatures are split into LSH bands, so a new resume is
+only compared against the few earlier ones that share a band: adding N resumes costs
+O(N), not O(N^2).
+
+    python dedup.py --threshold 0.9      # list near-duplicate groups in the talent pool
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from db_handler import DB_NAME, session
+
+# --- CONFIG ---
+DEFAULT_THRESHOLD = 0.9   # estimated Jaccard similarity of the shingle sets
+NUM_PERM = 128            # signature length
+SHINGLE = 5               # words per shingle
+LSH_RECALL = 0.95         # chance that a pair right at the threshold becomes a candidate
+MODES = ("flag", "collapse")
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_EMPTY = np.uint32(0xFFFFFFFF)
+_MULT = np.uint64(0x100000001B3)
+_POWERS = np.cumprod(np.full(64, 0x9E3779B97F4A7C15, dtype=np.uint64))   # longer words share the last power
+
+def _mix(h):
+    """splitmix64 finaliser, vectorised (uint64 arithmetic wraps)."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+def _word_hashes(texts):
+    """
+    Hashes every word of every text without a Python-level loop over words.
+    Words are runs of lowercase letters (digits and punctuation dropped; non-ASCII bytes count
+    as letters). Returns (word hashes, index of the text each word belongs to).
+    """
+    encoded = [(t or "").lower().encode("utf-8", "replace") for t in texts]
+    data = np.frombuffer(b" ".join(encoded), dtype=np.uint8)
+    letter = ((data >= 97) & (data <= 122)) | (data >= 128)
+    edges = np.diff(np.concatenate(([0], letter.view(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    if not len(starts):
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+
+    # Polynomial hash of each word: sum of byte * P^(position in word), summed per word with reduceat
+    lengths = ends - starts
+    first = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    position = np.arange(lengths.sum()) - np.repeat(first, lengths)
+    letters = data[letter].astype(np.uint64)
+    words = np.add.reduceat(letters * _POWERS[np.minimum(position, len(_POWERS) - 1)], first)
+
+    bounds = np.cumsum([len(e) + 1 for e in encoded])   # texts are joined with one space
+    return words, np.searchsorted(bounds, starts, side="right")
+
+def lsh_params(threshold, num_perm=NUM_PERM, recall=LSH_RECALL):
+    """
+    (bands, rows) for the LSH S-curve 1 - (1 - s^rows)^bands: the most selective banding
+    (fewest candidate comparisons) under which a pair exactly at the threshold still shares
+    a band with probability >= recall. Candidates are verified against the threshold anyway,
+    so extra candidates only cost a signature comparison.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+class DedupIndex:
+    """
+    Incremental near-duplicate index.
+
+    `add(key, text)` fingerprints a resume and returns the key of the first-seen resume it
+    duplicates (similarity >= threshold), or None if it is new. Only first-seen resumes are
+    indexed, so every duplicate points at one representative. In "collapse" mode callers
+    skip duplicates entirely; in "flag" mode they are still scored and just marked.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, mode="flag", num_perm=NUM_PERM, shingle=SHINGLE):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.mode = mode
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self.signatures = {}                        # key -> signature (first-seen resumes only)
+        self.duplicates = {}                        # key -> key of the resume it duplicates
+        self._digests = {}                          # exact PDF digest -> key
+        self._tables = [{} for _ in range(self.bands)]
+
+    @property
+    def collapse(self):
+        return self.mode == "collapse"
+
+    def signatures_for(self, texts):
+        """MinHash signatures (uint32 arrays of num_perm) for many texts at once; empty texts get None."""
+        k, K = self.shingle, self.num_perm
+        words, doc_of = _word_hashes(texts)
+        counts = np.bincount(doc_of, minlength=len(texts))
+        sigs = np.full((len(texts), K), _EMPTY, dtype=np.uint32)
+
+        # Rolling hash over k consecutive words, keeping only shingles that don't cross a document
+        n = len(words) - k + 1
+        if n > 0:
+            h = np.zeros(n, dtype=np.uint64)
+            for j in range(k):
+                h = h * _MULT + words[j:j + n]
+            inside = doc_of[:n] == doc_of[k - 1:]
+            shingles, owners = h[inside], doc_of[:n][inside]
+        else:
+            shingles, owners = np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        # Texts shorter than one shingle are a single shingle of all their words
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        short = np.flatnonzero((counts > 0) & (counts < k))
+        if len(short):
+            extra = np.zeros(len(short), dtype=np.uint64)
+            for j in range(k - 1):
+                has = counts[short] > j
+                extra[has] = extra[has] * _MULT + words[offsets[short[has]] + j]
+            shingles = np.concatenate([shingles, extra])
+            owners = np.concatenate([owners, short])
+
+        if len(shingles):
+            h = _mix(shingles)
+            bins = ((h >> np.uint64(32)) % np.uint64(K)).astype(np.int64)
+            np.minimum.at(sigs.reshape(-1), owners * K + bins, (h & _MASK32).astype(np.uint32))
+            self._densify(sigs)
+        return [sig if count else None for sig, count in zip(sigs, counts)]
+
+    @staticmethod
+    def _densify(sigs):
+        """Fills empty bins from the next non-empty bin to the right (wrapping), offset by the distance."""
+        K = sigs.shape[1]
+        empty = sigs == _EMPTY
+        if not empty.any():
+            return
+        doubled = np.concatenate([sigs, sigs], axis=1)
+        pos = np.where(np.concatenate([~empty, ~empty], axis=1), np.arange(2 * K), 2 * K)
+        nearest = np.minimum.accumulate(pos[:, ::-1], axis=1)[:, ::-1][:, :K]
+        rows, cols = np.nonzero(empty & (nearest < 2 * K))
+        src = nearest[rows, cols]
+        sigs[rows, cols] = doubled[rows, src] + (src - cols).astype(np.uint32) * np.uint32(0x9E3779B1)
+
+    def signature(self, text):
+        return self.signatures_for([text])[0]
+
+    def _bands(self, sig):
+        r = self.rows
+        return [sig[b * r:(b + 1) * r].tobytes() for b in range(self.bands)]
+
+    def similarity(self, a, b):
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(a == b)) / self.num_perm
+
+    def match(self, sig):
+        """Best indexed (key, similarity) at or above the threshold, else (None, 0.0)."""
+        best, best_sim = None, 0.0
+        seen = set()
+        for table, band in zip(self._tables, self._bands(sig)):
+            for key in table.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                sim = self.similarity(sig, self.signatures[key])
+                if sim >= self.threshold and sim > best_sim:
+                    best, best_sim = key, sim
+        return best, best_sim
+
+    def insert(self, key, sig):
+        """Indexes a signature as a first-seen resume (also used to restore a resumed job)."""
+        self.signatures[key] = sig
+        for table, band in zip(self._tables, self._bands(sig)):
+            table.setdefault(band, []).append(key)
+
+    def add_signature(self, key, sig):
+        if sig is None:
+            return None
+        original, _ = self.match(sig)
+        if original is None:
+            self.insert(key, sig)
+        else:
+            self.duplicates[key] = original
+        return original
+
+    def add(self, key, text):
+        return self.add_signature(key, self.signature(text))
+
+    def add_digest(self, key, digest):
+        """Exact byte-level repeat check, before any text is extracted. Returns the earlier key or None."""
+        original = self._digests.setdefault(digest, key)
+        if original == key:
+            return None
+        self.duplicates[key] = self.duplicates.get(original, original)
+        return self.duplicates[key]
+
+def find_duplicates(items, threshold=DEFAULT_THRESHOLD, chunk=2000):
+    """
+    Groups (key, text) pairs into near-duplicate clusters.
+    Returns {representative key: [duplicate keys]} for clusters of two or more.
+    """
+    index = DedupIndex(threshold)
+    batch = []
+
+    def flush():
+        for (key, _), sig in zip(batch, index.signatures_for([text for _, text in batch])):
+            index.add_signature(key, sig)
+        batch.clear()
+
+    for item in items:
+        batch.append(item)
+        if len(batch) >= chunk:
+            flush()
+    flush()
+
+    groups = {}
+    for key, original in index.duplicates.items():
+        groups.setdefault(original, []).append(key)
+    return groups
+
+def _stored_candidates(db_name, page=2000):
+    last = 0
+    while True:
+        with session(db_name) as conn:
+            rows = conn.execute("SELECT id, text FROM candidates WHERE id > ? ORDER BY id LIMIT ?", (last, page)).fetchall()
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1][0]
+
+def find_duplicate_candidates(threshold=DEFAULT_THRESHOLD, db_name=DB_NAME):
+    """Near-duplicate groups in the talent pool, as {candidate id: [duplicate candidate ids]}."""
+    return find_duplicates(_stored_candidates(db_name), threshold)
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="List near-duplicate resumes in the talent pool.")
+    cli.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    cli.add_argument("--db", default=DB_NAME)
+    args = cli.parse_args()
+
+    start = time.perf_counter()
+    groups = find_duplicate_candidates(args.threshold, args.db)
+    with session(args.db) as conn:
+        names = dict(conn.execute("SELECT id, filename FROM candidates"))
+    for original, dups in sorted(groups.items()):
+        print(f"#{original} {names.get(original)}: " + ", ".join(f"#{d} {names.get(d)}" for d in dups))
+    print(f"✅ {sum(map(len, groups.values()))} duplicates in {len(groups)} groups "
+          f"({time.perf_counter() - start:.1f}s)", file=sys.stderr)
@@ -0,0 +1,429 @@
+"""
+SQLite-backed job queue for batch rankings.
+
+The Streamlit app only enqueues a job (the uploaded PDFs go into `job_items`);
+a local worker process does the ranking and saves every result as soon as it is scored:
+
+    python job_queue.py worker
+
+A job whose worker dies is picked up again once its lease expires and
+continues with the items that are still pending.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from db_handler import DB_NAME, session, insert_scans, bootstrap
+from candidate_store import insert_candidates
+from batch_engine import rank_resumes, default_workers, DEFAULT_BATCH_SIZE
+from skills_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIG ---
+LEASE_SECONDS = 60        # a running job without a heartbeat for this long is reclaimed
+HEARTBEAT_SECONDS = 5
+POLL_SECONDS = 2
+PAGE_SIZE = 64            # pending items read from the queue at a time
+EXPORT_PAGE_SIZE = 5000   # finished items read at a time when exporting results
+WORKER_LOG = "talentsphere_worker.log"
+
+def init_jobs(db_name=DB_NAME):
+    with session(db_name) as conn:
+        c = conn.cursor()
+        # Jobs Table: one row per "RANK CANDIDATES" click
+        c.execute('''CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_name TEXT,
+                company_name TEXT,
+                job_role TEXT,
+                keywords TEXT,
+                workers INTEGER,
+                batch_size INTEGER,
+                status TEXT DEFAULT 'queued',
+                total INTEGER DEFAULT 0,
+                done INTEGER DEFAULT 0,
+                worker TEXT,
+                heartbeat REAL,
+                error TEXT,
+                created DATETIME DEFAULT CURRENT_TIMESTAMP,
+                finished DATETIME,
+                vocabulary TEXT,
+                dedup TEXT,
+                dedup_threshold REAL)''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, heartbeat)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_name, id)")
+
+        # One row per resume; the PDF is dropped once its result is stored
+        c.execute('''CREATE TABLE IF NOT EXISTS job_items (
+                job_id INTEGER,
+                idx INTEGER,
+                filename TEXT,
+                content BLOB,
+                status TEXT DEFAULT 'pending',
+                score REAL,
+                years_experience REAL,
+                email TEXT,
+                phone TEXT,
+                skills TEXT,
+                missing TEXT,
+                skill_bits BLOB,
+                candidate_id INTEGER,
+                duplicate_of INTEGER,
+                fingerprint BLOB,
+                error TEXT,
+                PRIMARY KEY (job_id, idx)) WITHOUT ROWID''')
+        # Queues created before the skill matrix lack its columns
+        _add_column(c, "jobs", "vocabulary", "TEXT")
+        _add_column(c, "job_items", "missing", "TEXT")
+        _add_column(c, "job_items", "skill_bits", "BLOB")
+        _add_column(c, "job_items", "candidate_id", "INTEGER")
+        _add_column(c, "jobs", "dedup", "TEXT")
+        _add_column(c, "jobs", "dedup_threshold", "REAL")
+        _add_column(c, "job_items", "duplicate_of", "INTEGER")
+        _add_column(c, "job_items", "fingerprint", "BLOB")
+        _add_column(c, "job_items", "error", "TEXT")
+
+        # Live workers, so the app knows whether it needs to start one
+        c.execute('''CREATE TABLE IF NOT EXISTS job_workers (
+                worker_id TEXT PRIMARY KEY,
+                pid INTEGER,
+                heartbeat REAL)''')
+
+def _add_column(c, table, column, decl):
+    if column not in [col[1] for col in c.execute(f"PRAGMA table_info({table})")]:
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+def enqueue_job(username, company_name, job_role, keywords, files, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                dedup=None, dedup_threshold=None, rejected=(), db_name=DB_NAME):
+    """
+    Stores a batch ranking job and its PDFs; returns the job id.
+    `files` is an iterable of (name, pdf_bytes) pairs, consumed one page at a time (e.g. an ArchiveReader).
+    `rejected` holds (name, reason) pairs of inputs that were skipped; it is read after `files` is exhausted.
+    `dedup` is None, "flag" or "collapse" (see dedup.DedupIndex).
+    """
+    with session(db_name) as conn:
+        c = conn.cursor()
+        # Not claimable until every PDF is stored
+        c.execute('''INSERT INTO jobs (user_name, company_name, job_role, keywords, workers, batch_size, vocabulary, dedup, dedup_threshold, status)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'ingesting')''',
+                  (username, company_name, job_role, json.dumps(list(keywords)), workers, batch_size,
+                   json.dumps(get_taxonomy().vocabulary(keywords)), dedup, dedup_threshold))
+        job_id = c.lastrowid
+
+    # Committed a page at a time: a big archive neither sits in memory nor holds the write lock throughout
+    idx = 0
+    try:
+        page = []
+        for name, data in files:
+            page.append((job_id, idx, name, data))
+            idx += 1
+            if len(page) >= PAGE_SIZE:
+                _store_items(page, db_name)
+        _store_items(page, db_name)
+        _store_items([(job_id, idx + i, name, None, "rejected", reason) for i, (name, reason) in enumerate(rejected)], db_name)
+        with session(db_name) as conn:
+            conn.execute('''UPDATE jobs SET status = 'queued',
+                                total = (SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status != 'rejected')
+                            WHERE id = ?''', (job_id, job_id))
+    except BaseException as e:
+        # Also on a Streamlit rerun/stop mid-upload: a job left 'ingesting' would never run or go away
+        reason = f"Upload failed: {e}" if isinstance(e, Exception) else "Upload interrupted"
+        with session(db_name) as conn:
+            conn.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ? AND status = 'ingesting'", (reason, job_id))
+        raise
+    return job_id
+
+def _store_items(page, db_name):
+    """Inserts (job_id, idx, filename, content[, status, error]) rows and empties the page."""
+    if page:
+        with session(db_name) as conn:
+            conn.executemany("INSERT INTO job_items (job_id, idx, filename, content, status, error) VALUES (?, ?, ?, ?, ?, ?)",
+                             (row if len(row) == 6 else row + ("pending", None) for row in page))
+        page.clear()
+
+def _job_dict(row):
+    keys = ("id", "user_name", "company_name", "job_role", "keywords", "workers", "batch_size",
+            "status", "total", "done", "worker", "heartbeat", "error", "created", "finished", "vocabulary",
+            "dedup", "dedup_threshold")
+    job = dict(zip(keys, row))
+    job["keywords"] = json.loads(job["keywords"])
+    job["vocabulary"] = json.loads(job["vocabulary"]) if job["vocabulary"] else get_taxonomy().vocabulary(job["keywords"])
+    return job
+
+def get_job(job_id, db_name=DB_NAME):
+    with session(db_name) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _job_dict(row) if row else None
+
+def list_jobs(username, limit=20, db_name=DB_NAME):
+    with session(db_name) as conn:
+        rows = conn.execute("SELECT * FROM jobs WHERE user_name = ? ORDER BY id DESC LIMIT ?", (username, limit)).fetchall()
+    return [_job_dict(row) for row in rows]
+
+def job_leaderboard(job_id, limit=-1, db_name=DB_NAME):
+    """
+    Results scored so far (the whole leaderboard once the job is done), best first; `limit` rows at most.
+    Flagged near-duplicates get a "Duplicate Of" column naming the resume they repeat.
+    """
+    with session(db_name) as conn:
+        rows = conn.execute('''SELECT i.filename, i.score, i.years_experience, i.email, i.phone, i.skills, o.filename
+                               FROM job_items i LEFT JOIN job_items o ON o.job_id = i.job_id AND o.idx = i.duplicate_of
+                               WHERE i.job_id = ? AND i.status = 'done'
+                               ORDER BY i.score DESC, i.years_experience DESC LIMIT ?''', (job_id, limit)).fetchall()
+    flagged = any(row[6] for row in rows)
+    results = []
+    for row in rows:
+        result = {
+            "Name": row[0],
+            "Score": row[1],
+            "Experience (Yrs)": row[2],
+            "Email": row[3],
+            "Phone": row[4],
+            "Skills": row[5]
+        }
+        if flagged:
+            result["Duplicate Of"] = row[6] or ""
+        results.append(result)
+    return results
+
+def job_rejected(job_id, db_name=DB_NAME):
+    """(filename, reason) for every uploaded file or archive member that was not ingested."""
+    with session(db_name) as conn:
+        return conn.execute("SELECT filename, error FROM job_items WHERE job_id = ? AND status = 'rejected' ORDER BY idx",
+                            (job_id,)).fetchall()
+
+def job_duplicates(job_id, db_name=DB_NAME):
+    """(filename, filename of the resume it repeats) for every collapsed near-duplicate."""
+    with session(db_name) as conn:
+        return conn.execute('''SELECT i.filename, o.filename
+                               FROM job_items i LEFT JOIN job_items o ON o.job_id = i.job_id AND o.idx = i.duplicate_of
+                               WHERE i.job_id = ? AND i.status = 'duplicate' ORDER BY i.idx''', (job_id,)).fetchall()
+
+def job_result_store(job_id, db_name=DB_NAME):
+    """All finished results of a job as a columnar ResultStore (for CSV / Parquet / Arrow export), read a page at a time."""
+    from result_store import ResultStore
+    store = ResultStore()
+    last = -1
+    while True:
+        with session(db_name) as conn:
+            rows = conn.execute('''SELECT i.idx, i.filename, i.score, i.years_experience, i.email, i.phone, i.skills, i.missing, o.filename
+                                   FROM job_items i LEFT JOIN job_items o ON o.job_id = i.job_id AND o.idx = i.duplicate_of
+                                   WHERE i.job_id = ? AND i.status = 'done' AND i.idx > ?
+                                   ORDER BY i.idx LIMIT ?''', (job_id, last, EXPORT_PAGE_SIZE)).fetchall()
+        if not rows:
+            return store
+        for _, filename, score, years, email, phone, skills, missing, original in rows:
+            store.append(filename, score, years, email, phone,
+                         skills.split(", ") if skills else (), missing.split(", ") if missing else (), original)
+        last = rows[-1][0]
+
+def job_skill_matrix(job_id, db_name=DB_NAME):
+    """Candidate x skill matrix of a job's finished items, for re-ranking without re-parsing."""
+    from skill_matrix import SkillMatrix
+    job = get_job(job_id, db_name)
+    with session(db_name) as conn:
+        rows = conn.execute('''SELECT filename, years_experience, email, phone, skill_bits, candidate_id FROM job_items
+                               WHERE job_id = ? AND status = 'done' AND skill_bits IS NOT NULL
+                               ORDER BY idx''', (job_id,)).fetchall()
+    return SkillMatrix.from_packed(job["vocabulary"], [r[4] for r in rows], [r[1] for r in rows], [r[0] for r in rows],
+                                   [{"Email": r[2], "Phone": r[3]} for r in rows], ids=[r[5] for r in rows])
+
+def job_report_entries(job_id, db_name=DB_NAME):
+    """(arcname, report args) for every finished item, in leaderboard order (see report_generator.write_report_zip)."""
+    with session(db_name) as conn:
+        rows = conn.execute('''SELECT filename, email, score, missing FROM job_items
+                               WHERE job_id = ? AND status = 'done'
+                               ORDER BY score DESC, years_experience DESC''', (job_id,)).fetchall()
+    entries = []
+    for rank, (filename, email, score, missing) in enumerate(rows, 1):
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        entries.append((f"{rank:04d}_{stem}.pdf", (filename, email or "", score, missing.split(", ") if missing else [], [])))
+    return entries
+
+def retry_job(job_id, db_name=DB_NAME):
+    """Puts a failed job back in the queue; finished items are not redone."""
+    with session(db_name) as conn:
+        conn.execute("UPDATE jobs SET status = 'queued', error = NULL WHERE id = ? AND status = 'failed'", (job_id,))
+
+# --- WORKER SIDE ---
+
+def claim_job(worker_id, db_name=DB_NAME):
+    """Takes the oldest queued job, or a running one whose worker stopped sending heartbeats."""
+    now = time.time()
+    with session(db_name) as conn:
+        # Take the write lock up front so two workers can't claim the same job
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute('''SELECT id FROM jobs
+                              WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?)
+                              ORDER BY id LIMIT 1''', (now - LEASE_SECONDS,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE jobs SET status = 'running', worker = ?, heartbeat = ? WHERE id = ?", (worker_id, now, row[0]))
+    return get_job(row[0], db_name)
+
+def _heartbeat(worker_id, job, db_name):
+    with session(db_name) as conn:
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO job_workers VALUES (?, ?, ?)", (worker_id, os.getpid(), now))
+        if job:
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ?", (now, job["id"], worker_id))
+
+def _pending_items(job_id, names, db_name):
+    """Streams the job's unfinished PDFs a page at a time, so memory stays flat for big jobs."""
+    last = -1
+    while True:
+        with session(db_name) as conn:
+            rows = conn.execute('''SELECT idx, filename, content FROM job_items
+                                   WHERE job_id = ? AND status = 'pending' AND idx > ?
+                                   ORDER BY idx LIMIT ?''', (job_id, last, PAGE_SIZE)).fetchall()
+        if not rows:
+            return
+        for idx, filename, content in rows:
+            names[idx] = filename
+            yield idx, content
+        last = rows[-1][0]
+
+def _job_dedup(job, db_name):
+    """The job's near-duplicate index, re-seeded with the fingerprints of items a previous run finished."""
+    if not job["dedup"]:
+        return None
+    import numpy as np
+    from dedup import DedupIndex, DEFAULT_THRESHOLD
+    dedup = DedupIndex(job["dedup_threshold"] or DEFAULT_THRESHOLD, job["dedup"])
+    with session(db_name) as conn:
+        rows = conn.execute('''SELECT idx, fingerprint FROM job_items
+                               WHERE job_id = ? AND status = 'done' AND fingerprint IS NOT NULL''', (job["id"],)).fetchall()
+    for idx, fingerprint in rows:
+        dedup.insert(idx, np.frombuffer(fingerprint, dtype=np.uint32))
+    return dedup
+
+def _save_duplicate(job, idx, original, db_name):
+    """Marks a collapsed near-duplicate as finished without scoring it."""
+    with session(db_name) as conn:
+        c = conn.cursor()
+        c.execute('''UPDATE job_items SET status = 'duplicate', content = NULL, duplicate_of = ?
+                     WHERE job_id = ? AND idx = ? AND status = 'pending' ''', (original, job["id"], idx))
+        if c.rowcount:
+            c.execute("UPDATE jobs SET done = done + 1, heartbeat = ? WHERE id = ?", (time.time(), job["id"]))
+
+def _save_result(job, filename, idx, parser, db_name, fingerprint=None):
+    """Stores one scored resume: queue item, scan history and talent pool in a single transaction."""
+    from skill_matrix import skill_presence, pack
+    data = parser.parsed_data
+    contact = data["contact_info"]
+    with session(db_name) as conn:
+        c = conn.cursor()
+        c.execute('''UPDATE job_items SET status = 'done', content = NULL, score = ?, years_experience = ?,
+                         email = ?, phone = ?, skills = ?, missing = ?, skill_bits = ?, duplicate_of = ?, fingerprint = ?
+                     WHERE job_id = ? AND idx = ? AND status = 'pending' ''',
+                  (data["match_score"], data["years_experience"], contact.get("email"), contact.get("phone"),
+                   ", ".join(data["skills_found"]), ", ".join(data["missing_keywords"]),
+                   pack(skill_presence(parser.raw_text.lower(), job["vocabulary"], parser.skill_ids())),
+                   data["duplicate_of"], fingerprint, job["id"], idx))
+        if c.rowcount == 0:
+            # Already stored by a previous run of this job
+            return
+        c.execute("UPDATE jobs SET done = done + 1, heartbeat = ? WHERE id = ?", (time.time(), job["id"]))
+        insert_scans(conn, [(job["user_name"], job["job_role"], data["match_score"], filename, data["missing_keywords"])])
+        # Link the item to its talent-pool row (used for relevance ranking)
+        candidate_id = insert_candidates(c, [(filename, parser)], job["company_name"])[0]
+        c.execute("UPDATE job_items SET candidate_id = ? WHERE job_id = ? AND idx = ?", (candidate_id, job["id"], idx))
+
+def process_job(job, worker_id, cache=None, db_name=DB_NAME):
+    names = {}
+    items = _pending_items(job["id"], names, db_name)
+    dedup = _job_dedup(job, db_name)
+    results = rank_resumes(items, job["keywords"], workers=job["workers"] or default_workers(),
+                           batch_size=job["batch_size"] or DEFAULT_BATCH_SIZE, cache=cache, dedup=dedup)
+    for idx, parser in results:
+        filename = names.pop(idx)
+        if parser is None:
+            _save_duplicate(job, idx, dedup.duplicates[idx], db_name)
+            continue
+        # First-seen resumes keep their fingerprint, so a resumed job still recognises their repeats
+        signature = dedup.signatures.get(idx) if dedup is not None else None
+        _save_result(job, filename, idx, parser, db_name, signature.tobytes() if signature is not None else None)
+
+    with session(db_name) as conn:
+        conn.execute("UPDATE jobs SET status = 'done', finished = CURRENT_TIMESTAMP WHERE id = ? AND worker = ?",
+                     (job["id"], worker_id))
+
+def run_worker(once=False, db_name=DB_NAME):
+    """Claims and processes jobs until stopped (or until the queue is empty with once=True)."""
+    from resume_cache import ResumeCache
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    cache = ResumeCache()
+    state = {"job": None}
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(HEARTBEAT_SECONDS):
+            try:
+                _heartbeat(worker_id, state["job"], db_name)
+            except Exception as e:
+                logger.warning("Heartbeat failed: %s", e)
+
+    _heartbeat(worker_id, None, db_name)
+    threading.Thread(target=beat, daemon=True).start()
+    logger.info("Worker %s started", worker_id)
+    try:
+        while True:
+            job = claim_job(worker_id, db_name)
+            if job is None:
+                if once:
+                    return
+                time.sleep(POLL_SECONDS)
+                continue
+
+            state["job"] = job
+            logger.info("Job %s: %s/%s done, resuming", job["id"], job["done"], job["total"])
+            try:
+                process_job(job, worker_id, cache, db_name)
+                logger.info("Job %s finished", job["id"])
+            except Exception as e:
+                logger.exception("Job %s failed", job["id"])
+                with session(db_name) as conn:
+                    conn.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ?", (str(e), job["id"]))
+            state["job"] = None
+    finally:
+        stop.set()
+        with session(db_name) as conn:
+            conn.execute("DELETE FROM job_workers WHERE worker_id = ?", (worker_id,))
+
+def ensure_worker(db_name=DB_NAME):
+    """Starts a background worker unless one is already alive. Returns True if one was started."""
+    with session(db_name) as conn:
+        # Check and register in one write transaction, so concurrent sessions can't both start a worker
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        alive = conn.execute("SELECT COUNT(*) FROM job_workers WHERE heartbeat > ?", (now - LEASE_SECONDS,)).fetchone()[0]
+        if alive:
+            return False
+        conn.execute("INSERT OR REPLACE INTO job_workers VALUES (?, ?, ?)", ("starting", None, now))
+    try:
+        with open(WORKER_LOG, "a") as log:
+            # Own session, so the worker outlives Streamlit reruns and restarts
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker"],
+                             stdout=log, stderr=log, stdin=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        with session(db_name) as conn:
+            conn.execute("DELETE FROM job_workers WHERE worker_id = 'starting'")
+        raise
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TalentSphere batch ranking worker.")
+    parser.add_argument("command", choices=["worker"])
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    bootstrap()
+    run_worker(once=args.once)
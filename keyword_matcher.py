@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+class KeywordMatcher:
+    """
+    Compiled multi-keyword matcher.
+
+    All terms are folded into one alternation, so a single scan of the text finds
+    every hit. With `boundary=True` each term must stand as a distinct word
+    (the same \\b...\\b rule as before: "java" does not match inside "javascript").
+    Expects lowercase terms and lowercase text.
+    """
+
+    def __init__(self, terms, boundary: bool = True):
+        self.terms = frozenset(terms)
+        self.boundary = boundary
+        # Longest first, so "machine learning" wins over "machine" at the same position
+        ordered = sorted((t for t in self.terms if t), key=len, reverse=True)
+        if ordered:
+            alternation = "|".join(re.escape(t) for t in ordered)
+            # Zero-width lookahead: overlapping hits ("machine learning" / "learning") are all seen
+            if boundary:
+                self._pattern = re.compile(r'\b(?=(' + alternation + r')\b)')
+            else:
+                self._pattern = re.compile(r'(?=(' + alternation + r'))')
+        else:
+            self._pattern = None
+
+        # A term that is a prefix of a longer one can be shadowed at the same start
+        # position, so it gets a separate check if the single scan missed it.
+        self._shadowed = [t for t in self.terms if not t or any(o != t and o.startswith(t) for o in ordered)]
+
+    def _term_pattern(self, term):
+        if self.boundary:
+            return r'\b' + re.escape(term) + r'\b'
+        return re.escape(term)
+
+    def find(self, text_lower: str) -> set:
+        """Returns the set of terms present in the text."""
+        found = set()
+        if self._pattern is not None:
+            wanted = len(self.terms)
+            for m in self._pattern.finditer(text_lower):
+                found.add(m.group(1))
+                if len(found) == wanted:
+                    break
+        for term in self._shadowed:
+            if term not in found and re.search(self._term_pattern(term), text_lower):
+                found.add(term)
+        return found
+
+
+@lru_cache(maxsize=256)
+def get_matcher(terms: Tuple[str, ...], boundary: bool = True) -> KeywordMatcher:
+    """Compiled matchers are cached per keyword set, so each list is built only once."""
+    return KeywordMatcher(terms, boundary)
+
+def find_keywords(keywords: List[str], text_lower: str) -> Tuple[List[str], List[str]]:
+    """
+    Splits `keywords` into (found, missing) against already-lowercased text,
+    keeping the caller's original spelling and order.
+    """
+    matcher = get_matcher(tuple(sorted({kw.lower() for kw in keywords})))
+    hits = matcher.find(text_lower)
+    found, missing = [], []
+    for kw in keywords:
+        (found if kw.lower() in hits else missing).append(kw)
+    return found, missing
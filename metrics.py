@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+from collections import deque
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Off unless TALENTSPHERE_METRICS=1 (or enable() is called): the hooks then cost one flag check
+ENABLED = os.environ.get("TALENTSPHERE_METRICS", "0") == "1"
+
+# Latency buckets in seconds (Prometheus-style cumulative histogram)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECENT_SAMPLES = 500
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+class MetricsRegistry:
+    """In-process store of per-stage durations, text sizes and counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}      # stage -> Histogram (seconds)
+        self.text_chars = {}   # stage -> [sum, count]
+        self.counters = {}     # name -> int
+
+    def observe(self, stage, seconds, chars=None):
+        with self._lock:
+            if stage not in self.latency:
+                self.latency[stage] = Histogram()
+            self.latency[stage].observe(seconds)
+            if chars is not None:
+                size = self.text_chars.setdefault(stage, [0, 0])
+                size[0] += chars
+                size[1] += 1
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.text_chars.clear()
+            self.counters.clear()
+
+    def summary(self):
+        """Per-stage count, mean and p50/p95 over the recent samples (for the admin panel)."""
+        rows = []
+        with self._lock:
+            for stage, h in sorted(self.latency.items()):
+                recent = sorted(h.recent)
+                chars = self.text_chars.get(stage)
+                rows.append({
+                    "Stage": stage,
+                    "Calls": h.count,
+                    "Mean (ms)": round(h.total / h.count * 1000, 2),
+                    "p50 (ms)": round(recent[len(recent) // 2] * 1000, 2),
+                    "p95 (ms)": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 2),
+                    "Avg Text (chars)": round(chars[0] / chars[1]) if chars else None,
+                })
+        return rows
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            lines.append("# HELP talentsphere_stage_seconds Time spent in each parsing pipeline stage.")
+            lines.append("# TYPE talentsphere_stage_seconds histogram")
+            for stage, h in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'talentsphere_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'talentsphere_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'talentsphere_stage_seconds_sum{{stage="{stage}"}} {h.total}')
+                lines.append(f'talentsphere_stage_seconds_count{{stage="{stage}"}} {h.count}')
+
+            lines.append("# HELP talentsphere_stage_text_chars_total Characters of resume text processed per stage.")
+            lines.append("# TYPE talentsphere_stage_text_chars_total counter")
+            for stage, (chars, _) in sorted(self.text_chars.items()):
+                lines.append(f'talentsphere_stage_text_chars_total{{stage="{stage}"}} {chars}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE talentsphere_{name} counter")
+                lines.append(f"talentsphere_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+def timed(stage, size=None):
+    """
+    Decorator recording the duration of `stage` (and optionally a text size,
+    computed from the call's arguments after it returns) when metrics are enabled.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                chars = size(*args, **kwargs) if size else None
+                REGISTRY.observe(stage, time.perf_counter() - start, chars)
+        return wrapper
+    return decorator
+
+def inc(name, n=1):
+    if ENABLED:
+        REGISTRY.inc(name, n)
+
+def write_prometheus(path):
+    """Writes the metrics to a textfile (e.g. for node_exporter's textfile collector)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(REGISTRY.render_prometheus())
+    os.replace(tmp, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def serve(port, host="127.0.0.1"):
+    """Starts a background /metrics endpoint for Prometheus to scrape."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,74 @@
+import threading
+from skills_taxonomy import get_taxonomy
+
+# --- CONFIG ---
+MODEL_NAME = "en_core_web_sm"
+# Only the tokenizer is used (relevance ranking), so every trained component is skipped.
+UNUSED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+class NLPRegistry:
+    """
+    Process-wide holder for the spaCy pipeline.
+    Built lazily on first use and shared by every ResumeParser.
+    Skill matching lives in skills_taxonomy and needs no spaCy at all.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        self.model_name = model_name
+        self._nlp = None
+        self._lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._build()
+        return self._nlp
+
+    def _build(self):
+        with self._lock:
+            # Another thread may have finished the build while we waited
+            if self._nlp is not None:
+                return
+            # spaCy takes about a second to import, so it is only loaded when a pipeline is needed
+            import spacy
+            try:
+                nlp = spacy.load(self.model_name, exclude=UNUSED_COMPONENTS)
+            except OSError:
+                # Model not downloaded: the blank English tokenizer is equivalent for tokenizing
+                nlp = spacy.blank("en")
+            self._nlp = nlp
+
+    def make_doc(self, text: str):
+        """Tokenizer-only Doc."""
+        return self.nlp.make_doc(text)
+
+    def pipe(self, texts, batch_size: int = 64):
+        """Tokenize many texts at once (used by relevance indexing)."""
+        return self.nlp.tokenizer.pipe(texts, batch_size=batch_size)
+
+    def terms(self, texts, batch_size: int = 64):
+        """Lowercased content words of each text (stop words, punctuation and whitespace dropped)."""
+        return [[t.lower_ for t in doc if not (t.is_stop or t.is_punct or t.is_space)]
+                for doc in self.pipe(texts, batch_size)]
+
+    def warmup(self):
+        self._build()
+        return self
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+def get_registry() -> NLPRegistry:
+    """Returns the shared registry, creating it on first call."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                _default_registry = NLPRegistry()
+    return _default_registry
+
+def warmup() -> NLPRegistry:
+    """Loads the model and the skills taxonomy up front (e.g. before timing, or in a worker)."""
+    get_taxonomy()
+    return get_registry().warmup()
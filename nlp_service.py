@@ -0,0 +1,315 @@
+"""
+Optional shared NLP service: one long-lived process per host holds the skills taxonomy and the
+spaCy tokenizer, and every app session, CLI run and batch worker on the host uses it over a Unix socket.
+
+    python nlp_service.py serve       # socket: $TALENTSPHERE_NLP_SOCKET (default: a private dir in $XDG_RUNTIME_DIR)
+    python nlp_service.py status
+
+Clients send texts in micro-batches: single-resume lookups made at the same time (several Streamlit
+sessions in one server, say) share one round trip, and batch ranking sends a whole chunk at once.
+When no service is listening, or it stops answering, everything runs in-process as before.
+
+Replies are unpickled, so clients only trust a socket owned by their own user in a directory only
+that user can write to, and authenticate with a random per-install key kept in a 0600 file.
+"""
+import argparse
+import logging
+import os
+import queue
+import secrets
+import signal
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager, RemoteError
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIG ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_DIR = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(), f"talentsphere-{os.getuid()}")
+SOCKET_PATH = os.environ.get("TALENTSPHERE_NLP_SOCKET") or os.path.join(RUNTIME_DIR, "nlp.sock")
+AUTHKEY_FILE = os.environ.get("TALENTSPHERE_NLP_AUTHKEY_FILE") or os.path.join(BASE_DIR, ".nlp_authkey")
+BATCH_MAX = 64          # texts per request
+CALL_TIMEOUT = 2        # seconds a single-resume lookup waits for the service before falling back
+RETRY_SECONDS = 30      # after the service was unreachable, stay in-process this long
+
+# Service gone, hung, restarted or misbehaving: the caller falls back to in-process matching
+CALL_ERRORS = (OSError, TimeoutError, EOFError, RemoteError, AuthenticationError)
+
+class UntrustedPath(OSError):
+    """A socket, directory or key file that another user could have planted or can tamper with."""
+
+def _check_private(path, kind):
+    """Raises UntrustedPath unless `path` is a `kind` owned by this user with no group/other write access."""
+    info = os.lstat(path)
+    checks = {"socket": stat.S_ISSOCK, "dir": stat.S_ISDIR, "file": stat.S_ISREG}
+    if not checks[kind](info.st_mode):
+        raise UntrustedPath(f"{path} is not a {kind}")
+    if info.st_uid != os.getuid():
+        raise UntrustedPath(f"{path} is owned by uid {info.st_uid}, not {os.getuid()}")
+    if info.st_mode & (0o077 if kind == "file" else 0o022):
+        raise UntrustedPath(f"{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})")
+
+def _check_socket(path):
+    _check_private(os.path.dirname(os.path.abspath(path)), "dir")
+    _check_private(path, "socket")
+
+def load_authkey(create=False):
+    """The per-install key from AUTHKEY_FILE (created with random bytes, mode 0600, when `create`)."""
+    if create and not os.path.exists(AUTHKEY_FILE):
+        try:
+            fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass   # another process created it first
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+    _check_private(AUTHKEY_FILE, "file")
+    with open(AUTHKEY_FILE) as f:
+        return f.read().strip().encode()
+
+class NLPService:
+    """The object served to clients: the taxonomy trie and the spaCy tokenizer, loaded once."""
+
+    def __init__(self):
+        from nlp_registry import warmup
+        from skills_taxonomy import get_taxonomy
+        self.registry = warmup()
+        self.taxonomy = get_taxonomy()
+        self.started = time.time()
+        self.requests = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+
+    def _count(self, texts):
+        with self._lock:
+            self.requests += 1
+            self.texts += len(texts)
+
+    def version(self):
+        return self.taxonomy.version
+
+    def find_skills(self, texts):
+        """Canonical skill IDs of each text (SkillTaxonomy.find)."""
+        self._count(texts)
+        return [self.taxonomy.find(text) for text in texts]
+
+    def terms(self, texts, batch_size=64):
+        """Content words of each text (NLPRegistry.terms)."""
+        self._count(texts)
+        return self.registry.terms(texts, batch_size)
+
+    def stats(self):
+        return {"pid": os.getpid(), "taxonomy": self.taxonomy.version, "model": self.registry.model_name,
+                "uptime_s": round(time.time() - self.started), "requests": self.requests, "texts": self.texts}
+
+class _Manager(BaseManager):
+    pass
+
+_Manager.register("service")
+
+# --- CLIENT ---
+
+class _Slot:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def result(self, timeout):
+        if not self.done.wait(timeout):
+            raise TimeoutError(f"NLP service did not answer within {timeout}s")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+class NLPClient:
+    """
+    Connection to a running service. Single-text skill lookups go through one sender thread,
+    which sends everything queued while the previous request was in flight as one batch.
+    """
+
+    def __init__(self, path=SOCKET_PATH, authkey=None):
+        # Check ownership before connecting: whatever answers on the socket gets unpickled here
+        _check_socket(path)
+        manager = _Manager(address=path, authkey=authkey if authkey is not None else load_authkey())
+        manager.connect()
+        self._service = manager.service()
+        self.version = self._service.version()
+        self._queue = None
+
+    def start(self):
+        """Starts the sender thread behind skills_for (not needed for batch calls or stats)."""
+        self._queue = queue.Queue()
+        threading.Thread(target=self._send, name="nlp-service-client", daemon=True).start()
+        return self
+
+    def _send(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                results = self._service.find_skills([text for text, _ in batch])
+            except Exception as e:
+                for _, slot in batch:
+                    slot.error = e
+                    slot.done.set()
+                continue
+            for (_, slot), ids in zip(batch, results):
+                slot.value = ids
+                slot.done.set()
+
+    def skills_for(self, text):
+        slot = _Slot()
+        self._queue.put((text, slot))
+        return slot.result(CALL_TIMEOUT)
+
+    def find_skills(self, texts):
+        found = []
+        for start in range(0, len(texts), BATCH_MAX):
+            found.extend(self._service.find_skills(texts[start:start + BATCH_MAX]))
+        return found
+
+    def terms(self, texts, batch_size=64):
+        return self._service.terms(texts, batch_size)
+
+    def stats(self):
+        return self._service.stats()
+
+def _connect(timeout=CALL_TIMEOUT):
+    """NLPClient(), raising TimeoutError if a hung service does not finish the handshake in time."""
+    slot = _Slot()
+
+    def connect():
+        try:
+            slot.value = NLPClient()
+        except Exception as e:
+            slot.error = e
+        slot.done.set()
+    threading.Thread(target=connect, name="nlp-service-connect", daemon=True).start()
+    return slot.result(timeout)
+
+_client = None
+_client_pid = None
+_retry_at = 0.0
+_client_lock = threading.Lock()
+
+def get_client():
+    """The connected client, or None when no (compatible) service is running or it failed recently."""
+    global _client, _client_pid, _retry_at
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    if time.monotonic() < _retry_at:
+        return None
+    with _client_lock:
+        # A forked process must not share its parent's connection
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        if time.monotonic() < _retry_at:
+            return None
+        _retry_at = time.monotonic() + RETRY_SECONDS
+        if not os.path.exists(SOCKET_PATH):
+            return None
+        try:
+            client = _connect()
+        except CALL_ERRORS as e:
+            logger.warning("NLP service at %s unreachable (%s); running in-process", SOCKET_PATH, e)
+            return None
+        from skills_taxonomy import get_taxonomy
+        if client.version != get_taxonomy().version:
+            # Skill IDs would not line up with this process's taxonomy. No sender thread was started,
+            # so dropping the client closes its connection.
+            logger.warning("NLP service has taxonomy %s, this process %s; running in-process",
+                           client.version, get_taxonomy().version)
+            return None
+        logger.info("Using the NLP service at %s", SOCKET_PATH)
+        _client, _client_pid = client.start(), os.getpid()
+        return _client
+
+def _call(method, *args):
+    client = get_client()
+    if client is None:
+        return None
+    try:
+        return getattr(client, method)(*args)
+    except CALL_ERRORS as e:
+        global _client, _retry_at
+        logger.warning("NLP service call failed (%s); running in-process", e)
+        with _client_lock:
+            if _client is client:
+                _client, _retry_at = None, time.monotonic() + RETRY_SECONDS
+        return None
+
+def skills_for(text):
+    """Skill IDs in one text from the service, or None to match in-process."""
+    return _call("skills_for", text) if text else None
+
+def find_skills(texts):
+    """Skill IDs for each of many texts in one round trip, or None to match in-process."""
+    texts = list(texts)
+    return _call("find_skills", texts) if texts else None
+
+def terms(texts, batch_size=64):
+    """Content-word lists for each text from the service's tokenizer, or None to tokenize in-process."""
+    texts = list(texts)
+    return _call("terms", texts, batch_size) if texts else None
+
+# --- SERVER ---
+
+def serve(path=SOCKET_PATH):
+    """Loads the taxonomy and tokenizer, then serves clients until interrupted."""
+    authkey = load_authkey(create=True)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    _check_private(directory, "dir")
+    if os.path.lexists(path):
+        # Only ever replace a socket of our own
+        _check_private(path, "socket")
+        try:
+            _Manager(address=path, authkey=authkey).connect()
+        except CALL_ERRORS:
+            # Left behind by a service that was killed
+            os.unlink(path)
+        else:
+            raise SystemExit(f"An NLP service is already listening on {path}")
+
+    service = NLPService()
+
+    class _Server(_Manager):
+        pass
+    _Server.register("service", callable=lambda: service)
+
+    # Socket readable and writable by this user only
+    umask = os.umask(0o177)
+    try:
+        server = _Server(address=path, authkey=authkey).get_server()
+    finally:
+        os.umask(umask)
+    # A clean exit (Ctrl-C or SIGTERM) lets the listener remove its socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info("NLP service (pid %s, taxonomy %s) listening on %s", os.getpid(), service.version(), path)
+    server.serve_forever()
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Shared NLP service for TalentSphere processes on this host.")
+    cli.add_argument("command", choices=["serve", "status"])
+    cli.add_argument("--socket", default=SOCKET_PATH)
+    args = cli.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "serve":
+        serve(args.socket)
+    else:
+        try:
+            print(NLPClient(args.socket).stats())
+        except CALL_ERRORS as e:
+            print(f"❌ No NLP service on {args.socket} ({e})", file=sys.stderr)
+            sys.exit(1)
@@ -2,6 +2,7 @@ import re
 import json
 from typing import List, Dict, Union
 from resume_loader import extract_text_from_pdf
+from keyword_matcher import find_keywords
 
 class ResumeParser:
     """
@@ -66,17 +67,11 @@ class ResumeParser:
         Analyze resume based on User Inputs (Keywords).
         """
         text_lower = self.raw_text.lower()
-        found = []
-        missing = []
 
-        for keyword in target_keywords:
-            # We look for the keyword as a distinct word (boundaried)
-            # This prevents finding "Java" inside "JavaScript"
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found.append(keyword)
-            else:
-                missing.append(keyword)
+        # We look for each keyword as a distinct word (boundaried)
+        # This prevents finding "Java" inside "JavaScript"
+        # All keywords are matched together in a single compiled scan
+        found, missing = find_keywords(target_keywords, text_lower)
 
         self.parsed_data["skills_found"] = found
         self.parsed_data["missing_keywords"] = missing
@@ -1,136 +1,261 @@
 import re
-import spacy
-from spacy.matcher import PhraseMatcher
-from resume_loader import extract_text_from_pdf
-from skills_db import SKILLS_DB
+from resume_loader import extract_text_from_pdf, read_pdf_bytes
+from nlp_registry import NLPRegistry, get_registry
+from keyword_matcher import find_keywords, get_matcher
+from skills_taxonomy import get_taxonomy
+from nlp_service import skills_for
+from metrics import timed
 
 # --- CONFIG ---
 ACTION_VERBS = ["developed", "led", "analyzed", "architected", "created", "designed", "implemented", "optimized", "managed", "deployed", "spearheaded"]
+SECTION_HEADERS = ["education", "experience", "projects"]
+LINKEDIN_MARKER = "linkedin.com"
+
+AUDIT_MARKERS = tuple(sorted(ACTION_VERBS + SECTION_HEADERS + [LINKEDIN_MARKER]))
+
+# --- COMPILED EXTRACTORS (built once, shared by every parser) ---
+# 1. Email: Standard Pattern
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+# 2. Phone (Integrated from parse_basic.py)
+# Matches: +91 9876543210, 987-654-3210, (123) 456-7890
+PHONE_RE = re.compile(r'(?:\+?\d{1,3})?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# 3. Experience: "5 years", "3+ yrs", "2.5 year"
+EXPERIENCE_RE = re.compile(r'(\d+(?:\.\d+)?)\+?\s*(?:years?|yrs?)')
+
+STAGES = ("contact", "experience", "audit", "match")
+
+def match_skills(keywords, skill_ids, text_lower):
+    """
+    Splits `keywords` into (found, missing), keeping the caller's spelling and order.
+    Keywords known to the taxonomy (by name or alias) are looked up in the resume's
+    canonical skill IDs; anything else falls back to a whole-word text match.
+    """
+    taxonomy = get_taxonomy()
+    ids = {kw: taxonomy.resolve(kw) for kw in keywords}
+    unknown = [kw for kw in keywords if ids[kw] is None]
+    missing_unknown = set(find_keywords(unknown, text_lower)[1]) if unknown else set()
+    hits = set(skill_ids)
+    found, missing = [], []
+    for kw in keywords:
+        ok = ids[kw] in hits if ids[kw] else kw not in missing_unknown
+        (found if ok else missing).append(kw)
+    return found, missing
+
+def _text_size(parser, *args, **kwargs):
+    return len(parser.raw_text)
+
+class ResumeAnalysis:
+    """Typed result of ResumeParser.analyze (only the requested stages are filled in)."""
+    __slots__ = ("stages", "email", "phone", "years_experience", "markers",
+                 "skills_found", "missing_keywords", "match_score", "audit_report")
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.email = "Not Found"
+        self.phone = "Not Found"
+        self.years_experience = 0
+        self.markers = set()
+        self.skills_found = []
+        self.missing_keywords = []
+        self.match_score = 0
+        self.audit_report = {}
+
+    @property
+    def contact_info(self):
+        return {"email": self.email, "phone": self.phone}
 
 class ResumeParser:
-    def __init__(self, file_path: str):
+    # `file_path` may also be the PDF itself (bytes, memoryview or a file-like upload)
+    def __init__(self, file_path: str, registry: NLPRegistry = None, text: str = None, cache=None, content_hash: str = None,
+                 skill_ids: list = None):
         self.file_path = file_path
+        # Shared, process-wide spaCy pipeline + skills matcher (loaded once)
+        self.registry = registry if registry is not None else get_registry()
+        # Optional ResumeCache: a hit skips PDF extraction and spaCy entirely
+        self.cache = cache
+        self.content_hash = content_hash
+        self._cached = None
+        # Precomputed taxonomy IDs (batch ranking asks the NLP service for a whole chunk at once)
+        self._skill_ids = skill_ids
         self.raw_text = ""
         self.parsed_data = {
             "contact_info": {}, "skills_found": [], "missing_keywords": [],
             "auto_extracted_skills": [], "match_score": 0, 
             "years_experience": 0,
-            "audit_report": {}, "interview_questions": [], "learning_roadmap": []
+            "audit_report": {}, "interview_questions": [], "learning_roadmap": [],
+            "duplicate_of": None
         }
-        
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            self.matcher = PhraseMatcher(self.nlp.vocab)
-            patterns = [self.nlp.make_doc(text) for text in SKILLS_DB]
-            self.matcher.add("TECH_SKILLS", patterns)
-        except:
-            pass
-            
-        self._load_content()
 
+        # Batch ranking extracts text in worker processes and hands it over directly
+        if text is None:
+            self._load_content()
+        else:
+            self.raw_text = text
+
+    @classmethod
+    def from_cache_entry(cls, file_path: str, entry: dict, registry: NLPRegistry = None):
+        """Builds a parser from a ResumeCache hit without touching the PDF."""
+        parser = cls(file_path, registry, text=entry["text"])
+        parser._cached = entry
+        return parser
+
+    @property
+    def nlp(self):
+        return self.registry.nlp
+
+    def skill_ids(self):
+        """Canonical taxonomy IDs of the skills in the resume (one trie walk, then memoised)."""
+        if self._skill_ids is None:
+            taxonomy = get_taxonomy()
+            if self._cached:
+                # Cached names come from the same taxonomy version, so no rescan is needed
+                self._skill_ids = [taxonomy.resolve(name) for name in self._cached["auto_extracted_skills"]]
+            else:
+                # The shared NLP service (nlp_service.py) when one is running, else this process's trie
+                ids = skills_for(self.raw_text)
+                self._skill_ids = ids if ids is not None else taxonomy.find(self.raw_text)
+        return self._skill_ids
+
+    @timed("load_content", size=_text_size)
     def _load_content(self):
         try:
-            self.raw_text = extract_text_from_pdf(self.file_path)
-            self.raw_text = " ".join(self.raw_text.split()) 
+            source = self.file_path
+            if self.cache is not None:
+                # Read once: the same buffer is hashed and, on a miss, handed to fitz
+                source = read_pdf_bytes(source)
+                self.content_hash = self.cache.key(source)
+                self._cached = self.cache.get(self.content_hash)
+                if self._cached:
+                    self.raw_text = self._cached["text"]
+                    return
+            # Already whitespace-normalised page by page, within the loader's size budgets
+            self.raw_text = extract_text_from_pdf(source)
         except:
             self.raw_text = ""
 
-    def extract_contact_details(self):
+    def _scan(self, keywords=None, stages=STAGES):
+        """Lowercases once and runs every requested extractor over that same copy."""
+        result = ResumeAnalysis(stages)
         text = self.raw_text
-        
-        # 1. Email Extraction
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        email = re.search(email_pattern, text)
-        
-        # 2. Phone Extraction (Integrated from parse_basic.py)
-        # Matches: +91 9876543210, 987-654-3210, (123) 456-7890
-        phone_pattern = r'(?:\+?\d{1,3})?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        
-        valid_phone = "Not Found"
-        for p in phones:
-            digits = re.sub(r'\D', '', p) # Clean non-digits
-            if 10 <= len(digits) <= 15:   # Standard validation
-                valid_phone = p
-                break
-
-        self.parsed_data["contact_info"] = {
-            "email": email.group() if email else "Not Found",
-            "phone": valid_phone
-        }
+        # Contact details are case-sensitive; every other stage shares this one lowercased copy
+        text_lower = text.lower() if any(s != "contact" for s in stages) else text
+
+        if "contact" in stages:
+            email = EMAIL_RE.search(text)
+            if email:
+                result.email = email.group()
+            for m in PHONE_RE.finditer(text):
+                # Phone Filter: skip false positives (like dates "2023-2024"), stop at the first real number
+                if 10 <= len(re.sub(r'\D', '', m.group())) <= 15:
+                    result.phone = m.group()
+                    break
+
+        if "experience" in stages:
+            matches = EXPERIENCE_RE.findall(text_lower)
+            if matches:
+                try:
+                    result.years_experience = max([float(x) for x in matches])
+                except:
+                    result.years_experience = 0
+
+        if "audit" in stages:
+            # All action verbs, section headers and the LinkedIn marker in one substring scan
+            result.markers = get_matcher(AUDIT_MARKERS, boundary=False).find(text_lower)
+            audit = {"suggestions": [], "score": 100}
+            action_count = len(result.markers.intersection(ACTION_VERBS))
+            if action_count < 3:
+                audit["suggestions"].append("⚠️ **Weak Impact:** Your resume lacks strong action verbs (e.g., Led, Developed).")
+                audit["score"] -= 15
+
+            if "education" not in result.markers:
+                audit["suggestions"].append("⚠️ **Structure:** 'Education' section not clearly detected.")
+                audit["score"] -= 10
+            if "experience" not in result.markers and "projects" not in result.markers:
+                audit["suggestions"].append("⚠️ **Structure:** 'Experience' or 'Projects' section missing.")
+                audit["score"] -= 10
+
+            if LINKEDIN_MARKER not in result.markers:
+                audit["suggestions"].append("⚠️ **Credibility:** Add a LinkedIn profile link.")
+                audit["score"] -= 5
+            result.audit_report = audit
+
+        if "match" in stages and keywords is not None:
+            # Taxonomy lookup for known skills (aliases included), text match for the rest
+            result.skills_found, result.missing_keywords = match_skills(keywords, self.skill_ids(), text_lower)
+            if keywords:
+                result.match_score = round((len(result.skills_found) / len(keywords)) * 100, 2)
+        return result
+
+    @timed("analyze", size=_text_size)
+    def analyze(self, keywords=None, stages=STAGES):
+        """
+        Fused analysis entry point: contact details, experience, structure audit
+        and keyword matching from one lowercased copy of the text.
+        Fills parsed_data for the stages run and returns a ResumeAnalysis.
+        """
+        stages = tuple(stages)
+        scan_stages = stages
+        if self._cached:
+            # Contact and experience are already known from the cache
+            scan_stages = tuple(s for s in stages if s not in ("contact", "experience"))
+        result = self._scan(keywords, scan_stages)
+
+        if "contact" in stages:
+            if self._cached:
+                contact = self._cached["contact_info"]
+                result.email, result.phone = contact["email"], contact["phone"]
+            self.parsed_data["contact_info"] = result.contact_info
+        if "experience" in stages:
+            if self._cached:
+                result.years_experience = self._cached["years_experience"]
+            self.parsed_data["years_experience"] = result.years_experience
+        if "audit" in stages:
+            self.parsed_data["audit_report"] = result.audit_report
+        if "match" in stages and keywords is not None:
+            self.parsed_data["skills_found"] = result.skills_found
+            self.parsed_data["missing_keywords"] = result.missing_keywords
+            self.parsed_data["match_score"] = result.match_score
+        result.stages = stages
+        return result
+
+    def extract_contact_details(self):
+        self.analyze(stages=("contact",))
 
     def extract_experience(self):
-        text = self.raw_text.lower()
-        pattern = r'(\d+(?:\.\d+)?)\+?\s*(?:years?|yrs?)'
-        matches = re.findall(pattern, text)
-        if matches:
-            try:
-                exp = max([float(x) for x in matches])
-                self.parsed_data["years_experience"] = exp
-            except:
-                self.parsed_data["years_experience"] = 0
+        self.analyze(stages=("experience",))
 
+    @timed("auto_extract_skills", size=_text_size)
     def auto_extract_skills(self):
         if not self.raw_text: return
-        doc = self.nlp(self.raw_text)
-        matches = self.matcher(doc)
-        found = set()
-        for match_id, start, end in matches:
-            found.add(doc[start:end].text)
-        self.parsed_data["auto_extracted_skills"] = list(found)
+        if self._cached:
+            self.parsed_data["auto_extracted_skills"] = list(self._cached["auto_extracted_skills"])
+            return
+        # Canonical names, so "NLP" and "Natural Language Processing" are one skill
+        taxonomy = get_taxonomy()
+        found = [taxonomy.name(sid) for sid in self.skill_ids()]
+        self.parsed_data["auto_extracted_skills"] = found
 
-    def match_keywords(self, target_keywords):
-        text_lower = self.raw_text.lower()
-        found = []
-        missing = []
-        for kw in target_keywords:
-            if re.search(r'\b' + re.escape(kw.lower()) + r'\b', text_lower):
-                found.append(kw)
-            else:
-                missing.append(kw)
+        # Last step of a full parse, so this is where the artifacts get cached
+        if self.cache is not None and self.content_hash:
+            facts = self._scan(stages=("contact", "experience"))
+            self.cache.put(self.content_hash, self.raw_text, facts.contact_info, facts.years_experience, found)
 
-        self.parsed_data["skills_found"] = found
-        self.parsed_data["missing_keywords"] = missing
-        
-        if target_keywords:
-            self.parsed_data["match_score"] = round((len(found) / len(target_keywords)) * 100, 2)
-        else:
-            self.parsed_data["match_score"] = 0
+    @timed("match_keywords", size=_text_size)
+    def match_keywords(self, target_keywords):
+        self.analyze(target_keywords, stages=("match",))
 
+    @timed("audit_resume", size=_text_size)
     def audit_resume(self):
-        text_lower = self.raw_text.lower()
-        audit = {"suggestions": [], "score": 100}
-        
-        action_count = len([v for v in ACTION_VERBS if v in text_lower])
-        if action_count < 3:
-            audit["suggestions"].append("⚠️ **Weak Impact:** Your resume lacks strong action verbs (e.g., Led, Developed).")
-            audit["score"] -= 15
-        
-        if "education" not in text_lower:
-            audit["suggestions"].append("⚠️ **Structure:** 'Education' section not clearly detected.")
-            audit["score"] -= 10
-        if "experience" not in text_lower and "projects" not in text_lower:
-            audit["suggestions"].append("⚠️ **Structure:** 'Experience' or 'Projects' section missing.")
-            audit["score"] -= 10
-            
-        if "linkedin.com" not in text_lower:
-            audit["suggestions"].append("⚠️ **Credibility:** Add a LinkedIn profile link.")
-            audit["score"] -= 5
-            
-        self.parsed_data["audit_report"] = audit
+        self.analyze(stages=("audit",))
 
     def generate_interview_questions(self):
-        q_bank = {
-            "Python": "Explain the Global Interpreter Lock (GIL).",
-            "SQL": "Difference between TRUNCATE and DELETE?",
-            "React": "Explain 'Lifting State Up' and useEffect.",
-            "AWS": "Difference between S3, EBS, and EFS?",
-            "Docker": "Difference between Image and Container?"
-        }
+        # Question bank lives in the taxonomy, so aliases ("ReactJS") get the same question
+        taxonomy = get_taxonomy()
         questions = []
         for skill in self.parsed_data["skills_found"]:
-            if skill in q_bank:
-                questions.append(f"**{skill}:** {q_bank[skill]}")
+            question = taxonomy.question(taxonomy.resolve(skill))
+            if question:
+                questions.append(f"**{skill}:** {question}")
         
         if len(questions) < 5: 
             questions.append("Describe a challenging technical bug you solved.")
@@ -0,0 +1,138 @@
+import math
+import threading
+from collections import Counter
+import numpy as np
+from nlp_registry import get_registry
+from nlp_service import terms as service_terms
+from db_handler import DB_NAME, session
+
+# --- BM25 PARAMETERS ---
+K1 = 1.2
+B = 0.75
+REFRESH_CHUNK = 500   # candidates tokenized per nlp.pipe call when catching up with the talent pool
+
+class RelevanceIndex:
+    """
+    Incremental BM25 index over resume texts.
+
+    Documents are tokenized with the shared spaCy tokenizer and stored as a sparse
+    term matrix (COO chunks, compacted into term-sorted postings before querying).
+    Vocabulary, document frequencies and lengths are updated as documents are added,
+    and a query scores every document at once with NumPy.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else get_registry()
+        self.vocab = {}            # term -> column
+        self.df = np.zeros(1024, dtype=np.int64)
+        self.doc_ids = []          # row -> external id (e.g. candidate id)
+        self.rows = {}             # external id -> row
+        self.doc_len = []
+        self.last_candidate_id = 0
+        self._chunks = []          # (rows, cols, tfs) per add() call
+        self._postings = None      # (ptr, doc_rows, tfs, doc_len), rebuilt after additions
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def add(self, items, batch_size=64):
+        """Indexes (doc_id, text) pairs; ids already in the index are skipped."""
+        items = [(doc_id, text) for doc_id, text in items if doc_id not in self.rows]
+        if not items:
+            return 0
+        term_lists = self._terms([text for _, text in items], batch_size)
+        rows, cols, tfs = [], [], []
+        with self._lock:
+            # Another session may have indexed some of these while they were being tokenized
+            fresh = [(doc_id, terms) for (doc_id, _), terms in zip(items, term_lists) if doc_id not in self.rows]
+            if not fresh:
+                return 0
+            for doc_id, terms in fresh:
+                counts = Counter(terms)
+                row = len(self.doc_ids)
+                self.rows[doc_id] = row
+                self.doc_ids.append(doc_id)
+                self.doc_len.append(sum(counts.values()))
+                for term, tf in counts.items():
+                    col = self.vocab.setdefault(term, len(self.vocab))
+                    rows.append(row)
+                    cols.append(col)
+                    tfs.append(tf)
+            cols = np.array(cols, dtype=np.int64)
+            if len(self.vocab) > len(self.df):
+                self.df = np.concatenate([self.df, np.zeros(max(len(self.vocab), 2 * len(self.df)) - len(self.df), dtype=np.int64)])
+            # Each (doc, term) pair appears once per document, so this is the document frequency
+            np.add.at(self.df, cols, 1)
+            self._chunks.append((np.array(rows, dtype=np.int64), cols, np.array(tfs, dtype=np.float32)))
+            self._postings = None
+        return len(fresh)
+
+    def _terms(self, texts, batch_size=64):
+        """Tokenized by the shared NLP service when one is running (see nlp_service.py), else in-process."""
+        terms = service_terms(texts, batch_size)
+        return terms if terms is not None else self.registry.terms(texts, batch_size)
+
+    def refresh_from_store(self, db_name=DB_NAME):
+        """Indexes talent-pool candidates added since the last refresh (high-water mark on candidates.id)."""
+        added = 0
+        # The index is shared by every session: one refresh at a time reads and advances the high-water mark
+        with self._lock:
+            while True:
+                with session(db_name) as conn:
+                    rows = conn.execute("SELECT id, text FROM candidates WHERE id > ? ORDER BY id LIMIT ?",
+                                        (self.last_candidate_id, REFRESH_CHUNK)).fetchall()
+                if not rows:
+                    if added:
+                        # Build the postings now, so the first query doesn't pay for it
+                        self._compact()
+                    return added
+                added += self.add(rows)
+                self.last_candidate_id = rows[-1][0]
+
+    def _compact(self):
+        if self._postings is None:
+            rows = np.concatenate([c[0] for c in self._chunks])
+            cols = np.concatenate([c[1] for c in self._chunks])
+            tfs = np.concatenate([c[2] for c in self._chunks])
+            order = np.argsort(cols, kind="stable")
+            ptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(cols, minlength=len(self.vocab)), out=ptr[1:])
+            self._chunks = [(rows, cols, tfs)]
+            self._postings = (ptr, rows[order], tfs[order], np.asarray(self.doc_len, dtype=np.float32))
+        return self._postings
+
+    def score(self, query_text):
+        """BM25 score of every indexed document against the query text (array aligned with doc rows)."""
+        with self._lock:
+            n = len(self.doc_ids)
+            if not n:
+                return np.zeros(0, dtype=np.float32)
+            ptr, doc_rows, tfs, lengths = self._compact()
+            avgdl = float(lengths.mean()) or 1.0
+            norm = K1 * (1.0 - B + B * lengths / avgdl)
+            scores = np.zeros(n, dtype=np.float32)
+            query = Counter(self._terms([query_text])[0])
+            for term, qtf in query.items():
+                col = self.vocab.get(term)
+                if col is None:
+                    continue
+                df = self.df[col]
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                start, end = ptr[col], ptr[col + 1]
+                d, tf = doc_rows[start:end], tfs[start:end]
+                scores[d] += qtf * idf * tf * (K1 + 1.0) / (tf + norm[d])
+            return scores
+
+    def relevance(self, query_text, doc_ids):
+        """
+        BM25 of the given documents rescaled to 0-100 (best of them = 100), aligned with `doc_ids`.
+        Ids that aren't indexed score 0.
+        """
+        scores = self.score(query_text)
+        rows = np.array([self.rows.get(i, -1) for i in doc_ids], dtype=np.int64)
+        out = np.zeros(len(rows), dtype=np.float32)
+        known = rows >= 0
+        out[known] = scores[rows[known]]
+        top = out.max() if len(out) else 0.0
+        return out * (100.0 / top) if top > 0 else out
@@ -1,42 +1,98 @@
-from fpdf import FPDF
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from metrics import timed
 
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 16)
-        self.set_text_color(0, 51, 102)
-        self.cell(0, 10, 'TalentSphere AI - Analysis Report', 0, 1, 'C')
-        self.ln(10)
+# Below this many reports a process pool costs more than it saves (one report is well under a millisecond)
+PARALLEL_MIN_REPORTS = 500
 
-def generate_report(filename, name, score, missing, roadmap):
-    pdf = PDFReport()
+@lru_cache(maxsize=None)
+def _report_class():
+    # fpdf is only imported once a report is actually rendered
+    from fpdf import FPDF
+
+    class PDFReport(FPDF):
+        def header(self):
+            self.set_font('Arial', 'B', 16)
+            self.set_text_color(0, 51, 102)
+            self.cell(0, 10, 'TalentSphere AI - Analysis Report', 0, 1, 'C')
+            self.ln(10)
+
+    return PDFReport
+
+def _latin1(text):
+    # Core PDF fonts are latin-1 only; anything else would make output() fail
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+@timed("render_report")
+def render_report(filename, name, score, missing, roadmap):
+    """Builds the analysis report and returns the PDF as bytes (nothing touches the disk)."""
+    pdf = _report_class()()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
-    
-    pdf.cell(0, 10, f"Candidate: {name}", ln=True)
-    pdf.cell(0, 10, f"File: {filename}", ln=True)
+
+    pdf.cell(0, 10, _latin1(f"Candidate: {name}"), ln=True)
+    pdf.cell(0, 10, _latin1(f"File: {filename}"), ln=True)
     pdf.set_font("Arial", 'B', 14)
     pdf.cell(0, 10, f"Match Score: {score}%", ln=True)
     pdf.ln(5)
-    
+
     pdf.set_font("Arial", 'B', 12)
     pdf.set_text_color(200, 0, 0)
     pdf.cell(0, 10, "Missing Skills:", ln=True)
     pdf.set_font("Arial", size=11)
     pdf.set_text_color(0, 0, 0)
-    
+
     if missing:
-        for m in missing: pdf.cell(0, 8, f"- {m}", ln=True)
+        for m in missing: pdf.cell(0, 8, _latin1(f"- {m}"), ln=True)
     else:
         pdf.cell(0, 8, "None - Perfect Match!", ln=True)
-        
+
     pdf.ln(5)
     pdf.set_font("Arial", 'B', 12)
     pdf.cell(0, 10, "Learning Roadmap:", ln=True)
     pdf.set_font("Arial", size=11)
     for r in roadmap:
-        clean = r.split("]")[0].replace("[", "").replace("**", "") 
-        pdf.cell(0, 8, f"- {clean}", ln=True)
+        clean = r.split("]")[0].replace("[", "").replace("**", "")
+        pdf.cell(0, 8, _latin1(f"- {clean}"), ln=True)
+
+    return pdf.output(dest='S').encode('latin-1')
+
+def report_filename(name):
+    return f"Report_{name.split('@')[0] if name and '@' in name else 'User'}.pdf"
+
+@timed("generate_report")
+def generate_report(filename, name, score, missing, roadmap):
+    """Older file-based API: writes Report_<name>.pdf into the working directory and returns its name."""
+    outfile = report_filename(name)
+    with open(outfile, "wb") as f:
+        f.write(render_report(filename, name, score, missing, roadmap))
+    return outfile
+
+def _render_entry(entry):
+    arcname, args = entry
+    return arcname, render_report(*args)
+
+def iter_reports(entries, workers=None):
+    """
+    Renders many reports, yielding (arcname, pdf_bytes) in input order.
+    `entries` is a list of (arcname, (filename, name, score, missing, roadmap)).
+    Large batches are spread over a process pool.
+    """
+    if len(entries) < PARALLEL_MIN_REPORTS or workers == 1:
+        for entry in entries:
+            yield _render_entry(entry)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_render_entry, entries, chunksize=64)
 
-    outfile = f"Report_{name.split('@')[0] if '@' in name else 'User'}.pdf"
-    pdf.output(outfile)
-    return outfile
\ No newline at end of file
+@timed("report_zip")
+def write_report_zip(entries, fileobj, workers=None):
+    """Streams the reports for a whole batch into one ZIP archive written to `fileobj`."""
+    # PDFs are already compressed, so members are stored as-is
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, data in iter_reports(entries, workers):
+            archive.writestr(arcname, data)
+    return fileobj
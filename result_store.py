@@ -0,0 +1,249 @@
+"""
+Columnar store for batch ranking results.
+
+Rows are appended into typed NumPy columns instead of one dict per candidate:
+scores and experience as float32, text fields as one UTF-8 buffer plus offsets,
+and skill lists as int32 codes into a dictionary seeded with SKILLS_DB.
+Exports walk the rows in rank order a chunk at a time, so CSV, Parquet and
+Arrow IPC files are written without ever materialising the whole table:
+
+    store = job_result_store(job_id)              # or ResultStore() + store.append(...)
+    store.write_csv(f); store.write_parquet(f); store.write_ipc(f)
+"""
+import csv
+import io
+import numpy as np
+from skills_db import SKILLS_DB
+
+# --- CONFIG ---
+EXPORT_CHUNK = 10_000   # rows per CSV chunk / Arrow record batch
+CSV_COLUMNS = ["Rank", "Name", "Score", "Experience (Yrs)", "Email", "Phone", "Skills"]
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+
+class _Column:
+    """Growable 1-D NumPy array (amortised O(1) append)."""
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, extra):
+        if self.size + extra > len(self._data):
+            grown = np.empty(max(self.size + extra, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+
+    def append(self, value):
+        self._reserve(1)
+        self._data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        self._reserve(len(values))
+        self._data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    @property
+    def values(self):
+        return self._data[:self.size]
+
+class _Strings:
+    """Append-only UTF-8 strings: one byte buffer plus int64 offsets (Arrow's large_string layout)."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = _Column(np.int64)
+        self.offsets.append(0)
+
+    def append(self, text):
+        self.data += (text or "").encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def take(self, rows):
+        """Decoded strings of the given rows."""
+        offsets = self.offsets.values
+        data = self.data
+        return [data[s:e].decode("utf-8") for s, e in zip(offsets[rows].tolist(), offsets[rows + 1].tolist())]
+
+    def to_arrow(self, pa):
+        return pa.Array.from_buffers(pa.large_string(), self.offsets.size - 1,
+                                     [None, pa.py_buffer(self.offsets.values), pa.py_buffer(self.data)])
+
+class _SkillLists:
+    """Lists of skills as int32 codes into a shared dictionary (SKILLS_DB first, unknown terms appended)."""
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.codes = _Column(np.int32)
+        self.offsets = _Column(np.int64)
+        self.offsets.append(0)
+
+    def append(self, skills):
+        self.codes.extend([self.dictionary.code(s) for s in skills])
+        self.offsets.append(self.codes.size)
+
+    def take_joined(self, rows, sep=", "):
+        """Each given row's skills joined into one string."""
+        offsets = self.offsets.values
+        starts, ends = offsets[rows].tolist(), offsets[rows + 1].tolist()
+        flat = self.codes.values[np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)] or [[]]).astype(np.int64)].tolist()
+        terms = self.dictionary.terms
+        out, pos = [], 0
+        for s, e in zip(starts, ends):
+            out.append(sep.join([terms[c] for c in flat[pos:pos + e - s]]))
+            pos += e - s
+        return out
+
+    def to_arrow(self, pa, dictionary):
+        values = pa.DictionaryArray.from_arrays(pa.array(self.codes.values, pa.int32()), dictionary)
+        return pa.LargeListArray.from_arrays(pa.array(self.offsets.values, pa.int64()), values)
+
+class _Dictionary:
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self._codes = {t: i for i, t in enumerate(self.terms)}
+
+    def code(self, term):
+        code = self._codes.get(term)
+        if code is None:
+            code = self._codes[term] = len(self.terms)
+            self.terms.append(term)
+        return code
+
+class ResultStore:
+    """Batch results as typed columns; rows come back in rank order (score, then experience)."""
+
+    def __init__(self, dictionary=SKILLS_DB):
+        self.dictionary = _Dictionary(dictionary)
+        self.score = _Column(np.float32)
+        self.experience = _Column(np.float32)
+        self.name = _Strings()
+        self.email = _Strings()
+        self.phone = _Strings()
+        self.duplicate_of = _Strings()
+        self.skills = _SkillLists(self.dictionary)
+        self.missing = _SkillLists(self.dictionary)
+        self.flagged = False   # any row marked as a near-duplicate
+
+    def __len__(self):
+        return self.score.size
+
+    def append(self, name, score, experience, email="", phone="", skills=(), missing=(), duplicate_of=None):
+        self.name.append(name)
+        self.score.append(score)
+        self.experience.append(experience)
+        self.email.append(email)
+        self.phone.append(phone)
+        self.skills.append(skills)
+        self.missing.append(missing)
+        self.duplicate_of.append(duplicate_of)
+        self.flagged = self.flagged or bool(duplicate_of)
+
+    def append_parser(self, name, parser):
+        data = parser.parsed_data
+        self.append(name, data["match_score"], data["years_experience"], data["contact_info"].get("email"),
+                    data["contact_info"].get("phone"), data["skills_found"], data["missing_keywords"], data["duplicate_of"])
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the columns."""
+        columns = [self.score, self.experience, self.skills.codes, self.skills.offsets, self.missing.codes, self.missing.offsets]
+        strings = [self.name, self.email, self.phone, self.duplicate_of]
+        return sum(c.values.nbytes for c in columns) + sum(len(s.data) + s.offsets.values.nbytes for s in strings)
+
+    def order(self):
+        """Row indices best first: score descending, then experience descending, then insertion order."""
+        return np.lexsort((np.arange(len(self)), -self.experience.values, -self.score.values))
+
+    def chunks(self, size=EXPORT_CHUNK, limit=None):
+        """Row indices in rank order, `size` at a time (only the best `limit` rows, if given)."""
+        order = self.order()[:limit]
+        for start in range(0, len(order), size):
+            yield start, order[start:start + size]
+
+    def _columns(self, rows):
+        """Leaderboard columns (display names) for the given rows, in that order."""
+        return {
+            "Name": self.name.take(rows),
+            "Score": np.round(self.score.values[rows].astype(np.float64), 2).tolist(),
+            "Experience (Yrs)": self.experience.values[rows].astype(np.float64).tolist(),
+            "Email": self.email.take(rows),
+            "Phone": self.phone.take(rows),
+            "Skills": self.skills.take_joined(rows),
+            **({"Duplicate Of": self.duplicate_of.take(rows)} if self.flagged else {}),
+        }
+
+    def rows(self, limit=None):
+        """Leaderboard dicts in rank order (the first `limit` only, if given)."""
+        columns = self._columns(self.order()[:limit])
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    # --- EXPORTS ---
+
+    def write_csv(self, fileobj, chunk=EXPORT_CHUNK, limit=None):
+        """Writes the ranking as UTF-8 CSV to a binary file object, one chunk of rows at a time."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS + (["Duplicate Of"] if self.flagged else []))
+        for start, rows in self.chunks(chunk, limit):
+            columns = self._columns(rows)
+            writer.writerows(zip(range(start + 1, start + 1 + len(rows)), *columns.values()))
+            fileobj.write(buffer.getvalue().encode("utf-8"))
+            buffer.seek(0)
+            buffer.truncate()
+        fileobj.write(buffer.getvalue().encode("utf-8"))
+        return fileobj
+
+    def _arrow(self):
+        import pyarrow as pa
+        dictionary = pa.array(self.dictionary.terms, pa.string())
+        columns = {
+            "name": self.name.to_arrow(pa),
+            "score": pa.array(self.score.values),
+            "years_experience": pa.array(self.experience.values),
+            "email": self.email.to_arrow(pa),
+            "phone": self.phone.to_arrow(pa),
+            "skills": self.skills.to_arrow(pa, dictionary),
+            "missing_skills": self.missing.to_arrow(pa, dictionary),
+        }
+        if self.flagged:
+            columns["duplicate_of"] = self.duplicate_of.to_arrow(pa)
+        # Zero-copy views over the columns; each exported batch is gathered from them in rank order
+        table = pa.table(columns)
+        schema = pa.schema([pa.field("rank", pa.int32())] + list(table.schema))
+        return pa, table, schema
+
+    def record_batches(self, chunk=EXPORT_CHUNK, limit=None):
+        """Yields pyarrow RecordBatches of at most `chunk` rows, in rank order (requires pyarrow)."""
+        return self._batches(*self._arrow(), chunk, limit)
+
+    def _batches(self, pa, table, schema, chunk, limit):
+        for start, rows in self.chunks(chunk, limit):
+            part = table.take(pa.array(rows))
+            rank = pa.array(np.arange(start + 1, start + 1 + len(rows), dtype=np.int32))
+            yield pa.RecordBatch.from_arrays([rank] + [c.combine_chunks() for c in part.columns], schema=schema)
+
+    def write_parquet(self, fileobj, chunk=EXPORT_CHUNK, limit=None):
+        """Streams the ranking to a Parquet file, one row group per chunk."""
+        import pyarrow.parquet as pq
+        pa, table, schema = self._arrow()
+        with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+            for batch in self._batches(pa, table, schema, chunk, limit):
+                writer.write_batch(batch)
+        return fileobj
+
+    def write_ipc(self, fileobj, chunk=EXPORT_CHUNK, limit=None):
+        """Streams the ranking to an Arrow IPC (Feather v2) file, one record batch per chunk."""
+        import pyarrow.ipc as ipc
+        pa, table, schema = self._arrow()
+        with ipc.new_file(fileobj, schema) as writer:
+            for batch in self._batches(pa, table, schema, chunk, limit):
+                writer.write_batch(batch)
+        return fileobj
+
+    def export(self, fmt, fileobj, chunk=EXPORT_CHUNK, limit=None):
+        """Writes the ranking (its best `limit` rows, if given) as "csv", "parquet" or "arrow" (see EXPORT_FORMATS)."""
+        writers = {"csv": self.write_csv, "parquet": self.write_parquet, "arrow": self.write_ipc}
+        if fmt not in writers:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(writers)}")
+        return writers[fmt](fileobj, chunk, limit)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+import threading
+from skills_db import SKILLS_DB_VERSION
+from db_handler import session
+from metrics import inc
+
+# Lives next to talentsphere_final.db
+CACHE_DB = "talentsphere_cache.db"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class ResumeCache:
+    """
+    Persistent, content-addressed cache of extracted resume artifacts.
+
+    Entries are keyed by the SHA-256 of the PDF bytes plus the skills-DB version,
+    so the same file uploaded by a seeker, a recruiter or a batch run is parsed once.
+    Eviction is least-recently-used once the stored text exceeds `max_bytes`.
+    """
+
+    def __init__(self, db_path: str = CACHE_DB, max_bytes: int = DEFAULT_MAX_BYTES, version: str = SKILLS_DB_VERSION):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        with session(self.db_path) as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS resume_cache (
+                    digest TEXT,
+                    version TEXT,
+                    text TEXT,
+                    contact TEXT,
+                    years_experience REAL,
+                    skills TEXT,
+                    size INTEGER,
+                    last_access REAL,
+                    PRIMARY KEY (digest, version))''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_cache_access ON resume_cache(last_access)")
+
+    @staticmethod
+    def key(data) -> str:
+        """SHA-256 of the raw PDF bytes (bytes, bytearray or memoryview)."""
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, digest: str):
+        """Returns the cached artifacts for a PDF digest, or None on a miss."""
+        with session(self.db_path) as conn:
+            row = conn.execute("SELECT text, contact, years_experience, skills FROM resume_cache WHERE digest=? AND version=?",
+                               (digest, self.version)).fetchone()
+            if row:
+                conn.execute("UPDATE resume_cache SET last_access=? WHERE digest=? AND version=?", (time.time(), digest, self.version))
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                inc("resume_cache_misses_total")
+                return None
+            self.hits += 1
+        inc("resume_cache_hits_total")
+        return {
+            "text": row[0],
+            "contact_info": json.loads(row[1]),
+            "years_experience": row[2],
+            "auto_extracted_skills": json.loads(row[3])
+        }
+
+    def put(self, digest: str, text: str, contact_info: dict, years_experience: float, skills: list):
+        size = len(text.encode("utf-8"))
+        with session(self.db_path) as conn:
+            conn.execute("INSERT OR REPLACE INTO resume_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (digest, self.version, text, json.dumps(contact_info), years_experience, json.dumps(skills), size, time.time()))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM resume_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Walk from the least recently used entry until we are back under budget
+        rows = conn.execute("SELECT rowid, size FROM resume_cache ORDER BY last_access").fetchall()
+        stale = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((rowid,))
+            total -= size
+        conn.executemany("DELETE FROM resume_cache WHERE rowid=?", stale)
+
+    def stats(self) -> dict:
+        with session(self.db_path) as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self):
+        with session(self.db_path) as conn:
+            conn.execute("DELETE FROM resume_cache")
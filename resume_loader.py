@@ -1,52 +1,120 @@
-import fitz  # PyMuPDF
+import re
 import sys
+import time
+import logging
 from pathlib import Path  # This is the "Pro" way to handle file paths
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+logger = logging.getLogger(__name__)
+
+# Early-stop signals: once a page has shown contact details and a skills section, we have what we need
+CONTACT_SIGNAL = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}|\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+SKILLS_SIGNAL = re.compile(r'\bskills\b', re.IGNORECASE)
+
+def read_pdf_bytes(source):
+    """
+    Returns the raw PDF bytes for any supported source without copying in-memory buffers.
+    Paths are read from disk; bytes/bytearray/memoryview are returned as-is;
+    file-like objects expose their buffer via getbuffer() when possible (BytesIO, Streamlit uploads).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return source.read()
+    return Path(source).read_bytes()
+
+def open_pdf(source):
+    """Opens a PDF from a path or, via fitz's stream interface, from memory."""
+    import fitz  # PyMuPDF, imported on first use to keep module import cheap
+    if isinstance(source, (str, Path)):
+        return fitz.open(source)
+    return fitz.open(stream=read_pdf_bytes(source), filetype="pdf")
+
+def _check_source(pdf_source):
+    """Validates path sources up front and returns a display label."""
+    if isinstance(pdf_source, (str, Path)):
+        # 1. Path Safety: Convert string path to a proper Path object
+        file_path = Path(pdf_source)
+
+        # 2. Validation: Check if file actually exists before trying to open it
+        if not file_path.exists():
+            raise FileNotFoundError(f"CRITICAL ERROR: The file '{file_path}' was not found. Check the name and folder.")
+        return file_path.name
+    return getattr(pdf_source, "name", "<in-memory PDF>")
+
+def iter_pdf_pages(pdf_source, max_pages=None, max_chars=None, timeout=None, early_stop=False):
+    """
+    Lazily yields the whitespace-normalised text of each non-empty page.
+
+    Budgets (all off by default; None disables each one):
+      max_pages  - stop after this many pages
+      max_chars  - stop once this many characters were yielded (the last page is truncated)
+      timeout    - stop once this many seconds have passed
+      early_stop - stop once contact details and a skills section have both been seen (on any pages so far);
+                   there is no separate header check, as the header is on page 1, which is always read
+    Only one page of text is held at a time, so memory stays flat for huge documents.
+    """
+    label = _check_source(pdf_source)
+    deadline = time.monotonic() + timeout if timeout else None
+    remaining = max_chars
+    seen = set()
+
+    with open_pdf(pdf_source) as doc:
+        logger.debug("Processing: %s (%d pages)...", label, len(doc))
+
+        for page_num, page in enumerate(doc, start=1):
+            if max_pages is not None and page_num > max_pages:
+                logger.warning("%s: page budget reached, text cut after %d pages", label, max_pages)
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning("%s: extraction timed out after %d pages", label, page_num - 1)
+                break
+
+            # Extract text preserving natural reading blocks, then collapse whitespace
+            page_text = " ".join(page.get_text().split())
+            if not page_text:
+                logger.debug("Page %d of %s appears to be empty or an image.", page_num, label)
+                continue
+
+            if remaining is not None:
+                page_text = page_text[:remaining]
+                remaining -= len(page_text)
+            yield page_text
+
+            if remaining is not None and remaining <= 0:
+                logger.warning("%s: character budget reached, text cut at %d characters", label, max_chars)
+                break
+            if early_stop:
+                if CONTACT_SIGNAL.search(page_text):
+                    seen.add("contact")
+                if SKILLS_SIGNAL.search(page_text):
+                    seen.add("skills")
+                if len(seen) == 2:
+                    break
+
+def extract_text_from_pdf(pdf_source, **budgets) -> str:
     """
     Robustly extracts text from a PDF file.
+    Accepts a path (CLI use) or the PDF itself as bytes, memoryview or a file-like object,
+    so uploads can be parsed without ever touching the filesystem.
+    Returns whitespace-normalised text; keyword arguments are passed to iter_pdf_pages as budgets.
     Handles file not found, bad file types, and empty (scanned) PDFs.
     """
-    
-    # 1. Path Safety: Convert string path to a proper Path object
-    file_path = Path(pdf_path)
-
-    # 2. Validation: Check if file actually exists before trying to open it
-    if not file_path.exists():
-        raise FileNotFoundError(f"CRITICAL ERROR: The file '{file_path}' was not found. Check the name and folder.")
+    _check_source(pdf_source)
 
     try:
-        # 3. Open the PDF safely
-        doc = fitz.open(file_path)
-        text_content = []
+        full_text = " ".join(iter_pdf_pages(pdf_source, **budgets))
 
-        # 4. Loop through pages with a progress indicator
-        print(f"Processing: {file_path.name} ({len(doc)} pages)...")
-        
-        for page_num, page in enumerate(doc, start=1):
-            # Extract text preserving natural reading blocks
-            page_text = page.get_text()
-            
-            # clean up excessive whitespace just a little bit to avoid massive gaps
-            if page_text.strip():
-                text_content.append(f"--- Page {page_num} ---")
-                text_content.append(page_text)
-            else:
-                print(f"Warning: Page {page_num} appears to be empty or an image.")
-
-        # 5. Close the document to free up memory (Crucial for large systems)
-        doc.close()
-
-        # 6. Check for "Scanned PDF" issue
-        full_text = "\n".join(text_content)
-        if not full_text.strip():
+        # Check for "Scanned PDF" issue
+        if not full_text:
             raise ValueError("EMPTY OUTPUT: This appears to be a scanned image-based PDF. This parser requires selectable text.")
 
         return full_text
 
     except Exception as e:
         # If anything breaks (corrupt file, encryption), catch it here.
-        print(f"An error occurred while processing the PDF: {e}")
+        logger.warning("An error occurred while processing the PDF: %s", e)
         return ""
 
 # --- Professional Testing Block ---
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from resume_cache import ResumeCache
+from metrics import inc
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024   # per browser session
+
+class SessionCorpusCache:
+    """
+    In-memory LRU of parsed resume artifacts for one Streamlit session, keyed by upload content hash.
+
+    Drop-in for ResumeCache (same key/get/put), optionally in front of it: when the user
+    only edits the skills input, reruns find the text, contact details, experience and
+    auto skills here and just redo the matching. Entries are evicted least-recently-used
+    once their text exceeds `max_bytes`.
+    """
+
+    key = staticmethod(ResumeCache.key)
+
+    def __init__(self, backing: ResumeCache = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.backing = backing
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()   # digest -> (entry, size)
+        self._lock = threading.Lock()
+
+    def get(self, digest: str):
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                inc("session_cache_hits_total")
+                return self._entries[digest][0]
+        inc("session_cache_misses_total")
+        entry = self.backing.get(digest) if self.backing is not None else None
+        if entry:
+            self._store(digest, entry)
+        return entry
+
+    def put(self, digest: str, text: str, contact_info: dict, years_experience: float, skills: list):
+        self._store(digest, {
+            "text": text,
+            "contact_info": contact_info,
+            "years_experience": years_experience,
+            "auto_extracted_skills": list(skills)
+        })
+        if self.backing is not None:
+            self.backing.put(digest, text, contact_info, years_experience, skills)
+
+    def _store(self, digest, entry):
+        size = len(entry["text"]) + sum(len(s) for s in entry["auto_extracted_skills"])
+        with self._lock:
+            if digest in self._entries:
+                self.size -= self._entries.pop(digest)[1]
+            self._entries[digest] = (entry, size)
+            self.size += size
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,111 @@
+import numpy as np
+from keyword_matcher import get_matcher
+from skills_taxonomy import get_taxonomy
+
+def _skill_key(skill):
+    # Aliases collapse onto their canonical ID ("NLP" == "Natural Language Processing")
+    return get_taxonomy().key(skill)
+
+def skill_presence(text_lower, vocab, skill_ids):
+    """Boolean vector aligned with `vocab`: taxonomy skills from the resume's IDs, other terms by one text scan."""
+    taxonomy = get_taxonomy()
+    ids = set(skill_ids)
+    keys = [taxonomy.resolve(s) for s in vocab]
+    others = tuple(sorted({s.lower() for s, key in zip(vocab, keys) if key is None}))
+    hits = get_matcher(others).find(text_lower) if others else set()
+    return np.fromiter((key in ids if key else s.lower() in hits for s, key in zip(vocab, keys)),
+                       dtype=bool, count=len(vocab))
+
+def pack(presence):
+    return np.packbits(presence).tobytes()
+
+class SkillMatrix:
+    """
+    Candidate x skill boolean matrix for a ranked batch.
+
+    Built once from the parsed resumes; scoring is then a matrix-vector product,
+    so changing weights or must-haves re-ranks without touching any PDF.
+    """
+
+    def __init__(self, vocab, presence, experience, names, details=None, ids=None):
+        self.vocab = list(vocab)
+        self.index = {_skill_key(s): i for i, s in enumerate(self.vocab)}
+        self.presence = presence                     # (candidates, skills) bool
+        self.experience = np.asarray(experience, dtype=np.float32)
+        self.names = list(names)
+        self.details = details or [{} for _ in self.names]   # extra columns per candidate (email, phone, ...)
+        self.ids = list(ids) if ids is not None else [None] * len(self.names)   # talent-pool candidate ids
+        self._dense = None
+
+    @classmethod
+    def from_packed(cls, vocab, rows, experience, names, details=None, ids=None):
+        """Rebuilds the matrix from per-candidate np.packbits rows (as stored by the job queue)."""
+        if not rows:
+            return cls(vocab, np.zeros((0, len(vocab)), dtype=bool), experience, names, details, ids)
+        packed = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+        presence = np.unpackbits(packed, axis=1, count=len(vocab)).astype(bool)
+        return cls(vocab, presence, experience, names, details, ids)
+
+    def __len__(self):
+        return len(self.names)
+
+    def columns(self, skills):
+        return np.array([self.index[_skill_key(s)] for s in skills if _skill_key(s) in self.index], dtype=np.intp)
+
+    def score(self, weights, must_have=(), experience_bonus=0.0, experience_cap=10.0, relevance=None, relevance_weight=0.0):
+        """
+        Weighted share of matched skills (0-100), plus `experience_bonus` points per year
+        up to `experience_cap` years. Candidates missing a must-have skill get -inf.
+        With all weights 1 and no bonus this is the same score as match_keywords.
+        `relevance` (0-100 per candidate, see relevance.py) is blended in by `relevance_weight`.
+        """
+        if self._dense is None:
+            self._dense = self.presence.astype(np.float32)
+        w = np.zeros(len(self.vocab), dtype=np.float32)
+        for skill, weight in weights.items():
+            if _skill_key(skill) in self.index:
+                w[self.index[_skill_key(skill)]] = weight
+        total = w.sum()
+        scores = self._dense @ w * (100.0 / total) if total > 0 else np.zeros(len(self), dtype=np.float32)
+        if relevance is not None and relevance_weight:
+            scores = (1.0 - relevance_weight) * scores + relevance_weight * relevance
+        if experience_bonus:
+            scores = scores + experience_bonus * np.minimum(self.experience, experience_cap)
+
+        must = self.columns(must_have)
+        if len(must):
+            scores = np.where(self.presence[:, must].all(axis=1), scores, -np.inf)
+        return scores
+
+    def top_k(self, scores, k):
+        """Indices of the k best candidates, best first (argpartition, then a sort of only the shortlist)."""
+        eligible = int(np.isfinite(scores).sum())
+        k = min(k, eligible)
+        if k <= 0:
+            return np.array([], dtype=np.intp)
+        if k < len(scores):
+            # Everyone tied with the kth score stays in, so experience decides the cut, not argpartition
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            idx = np.flatnonzero(scores >= kth)
+        else:
+            idx = np.flatnonzero(np.isfinite(scores))
+        # Ties broken by experience, like the original leaderboard sort
+        order = np.lexsort((-self.experience[idx], -scores[idx]))
+        return idx[order][:k]
+
+    def leaderboard(self, weights, must_have=(), experience_bonus=0.0, experience_cap=10.0, k=100,
+                    relevance=None, relevance_weight=0.0):
+        """Top-k rows ready for a DataFrame: Name, Score, (Relevance,) Experience, details and matched skills."""
+        scores = self.score(weights, must_have, experience_bonus, experience_cap, relevance, relevance_weight)
+        wanted = [s for s, weight in weights.items() if weight and _skill_key(s) in self.index]
+        cols = self.columns(wanted)
+        rows = []
+        for i in self.top_k(scores, k):
+            row = {"Name": self.names[i], "Score": round(float(scores[i]), 2)}
+            if relevance is not None:
+                row["Relevance"] = round(float(relevance[i]), 2)
+            row["Experience (Yrs)"] = float(self.experience[i])
+            row.update(self.details[i])
+            row["Skills"] = ", ".join(wanted[j] for j in np.flatnonzero(self.presence[i, cols]))
+            rows.append(row)
+        return rows
@@ -1,24 +1,12 @@
 # skills_db.py
-# A list of skills we want our AI to recognize automatically.
+# The skills we want our AI to recognize automatically.
+# Edit skills_taxonomy.json (names, aliases, categories); this module exposes its canonical names.
 
-SKILLS_DB = [
-    # Programming Languages
-    "Python", "Java", "C++", "JavaScript", "TypeScript", "HTML", "CSS", "SQL", "NoSQL",
-    "R", "Go", "Swift", "Kotlin", "PHP", "Ruby", "Matlab",
-    
-    # Data Science & ML
-    "Machine Learning", "Deep Learning", "Pandas", "NumPy", "Scikit-learn", 
-    "TensorFlow", "Keras", "PyTorch", "NLP", "Natural Language Processing",
-    "Computer Vision", "Data Analysis", "Statistics", "Power BI", "Tableau",
-    
-    # Web Development
-    "React", "Angular", "Vue", "Django", "Flask", "FastAPI", "Node.js", 
-    "Express", "Spring Boot", "ASP.NET", "Bootstrap", "Tailwind",
-    
-    # Cloud & DevOps
-    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", 
-    "Git", "GitHub", "Linux", "CI/CD", "Terraform",
-    
-    # Databases
-    "MySQL", "PostgreSQL", "MongoDB", "Redis", "Oracle", "SQLite"
-]
\ No newline at end of file
+from skills_taxonomy import get_taxonomy
+
+_taxonomy = get_taxonomy()
+
+SKILLS_DB = list(_taxonomy.names)
+
+# Changes automatically whenever the taxonomy changes (used to invalidate cached extractions)
+SKILLS_DB_VERSION = _taxonomy.version
@@ -0,0 +1,225 @@
+"""
+Skills taxonomy: canonical skill IDs with names, categories, aliases and interview questions.
+
+The JSON source (skills_taxonomy.json) is compiled into a pickled token trie whose
+version is the hash of the source. The artifact is only written by the compile command;
+at startup it is loaded as-is when it matches the source, and otherwise the JSON is
+compiled in memory (nothing is written next to the code at runtime).
+
+    python skills_taxonomy.py compile            # rebuild skills_taxonomy.pkl
+    python skills_taxonomy.py check              # spellings that must (not) match, see MATCH_CHECKS
+    python skills_taxonomy.py find resume.txt    # show the skills found in a text file
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import stat
+import sys
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TAXONOMY_SOURCE = os.path.join(BASE_DIR, "skills_taxonomy.json")
+TAXONOMY_ARTIFACT = os.path.join(BASE_DIR, "skills_taxonomy.pkl")
+ARTIFACT_FORMAT = 2
+
+# (text, skill id, expected): skills are matched in any case, as the original keyword regex did.
+# Only the exact spellings listed under "not_skill" (English words in prose) are rejected.
+MATCH_CHECKS = [
+    ("GO, Rust", "go", True), ("Go developer", "go", True), ("golang", "go", True), ("GOLANG", "go", True),
+    ("ready to go live", "go", False),
+    ("SWIFT", "swift", True), ("Swift, Kotlin", "swift", True), ("a swift learner", "swift", False),
+    ("ORACLE DB", "oracle", True), ("oracle", "oracle", True),
+    ("r programming", "r", True), ("R, Python", "r", True),
+    ("EXPRESS", "express", True), ("Express.js", "express", True), ("expressjs", "express", True),
+    ("express interest", "express", False),
+]
+
+# Words and single punctuation marks, so "C++", "Node.js" and "CI/CD" keep their symbols
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_END = ""   # trie key marking the end of an alias (real tokens are never empty)
+
+def tokenize(text):
+    return TOKEN_RE.findall(text)
+
+def _key(text):
+    return " ".join(t.lower() for t in tokenize(text))
+
+def source_version(source=TAXONOMY_SOURCE):
+    with open(source, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def compile_taxonomy(source=TAXONOMY_SOURCE):
+    """Parses and validates the JSON source into the artifact structure (skills, trie, alias lookup)."""
+    with open(source, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+
+    skills, order, trie, lookup = {}, [], {}, {}
+    for entry in data["skills"]:
+        sid = entry["id"]
+        if sid in skills:
+            raise ValueError(f"Duplicate skill id {sid!r}")
+        skills[sid] = {
+            "name": entry["name"],
+            "category": entry.get("category", "General"),
+            "aliases": entry.get("aliases", []),
+            "question": entry.get("question"),
+        }
+        order.append(sid)
+        # Exact spellings that are ordinary words, not the skill ("go" in "ready to go")
+        not_skill = {tuple(tokenize(form)) for form in entry.get("not_skill", [])}
+        surfaces = [entry["name"]] + entry.get("aliases", [])
+        for form in not_skill:
+            if " ".join(form).lower() not in {_key(surface) for surface in surfaces}:
+                raise ValueError(f"not_skill form {' '.join(form)!r} of {sid!r} is not a spelling of its name or aliases")
+        for surface in surfaces:
+            tokens = tokenize(surface)
+            if not tokens:
+                continue
+            key = _key(surface)
+            if lookup.get(key, sid) != sid:
+                raise ValueError(f"Alias {surface!r} of {sid!r} already belongs to {lookup[key]!r}")
+            lookup[key] = sid
+            node = trie
+            for token in tokens:
+                node = node.setdefault(token.lower(), {})
+            rejected = frozenset(form for form in not_skill if _key(" ".join(form)) == _key(surface))
+            node.setdefault(_END, []).append((sid, rejected or None))
+
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": hashlib.sha256(raw).hexdigest()[:12],
+        "skills": skills,
+        "order": order,
+        "trie": trie,
+        "lookup": lookup,
+    }
+
+def build_artifact(source=TAXONOMY_SOURCE, artifact=TAXONOMY_ARTIFACT):
+    compiled = compile_taxonomy(source)
+    tmp = artifact + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, artifact)
+    return compiled
+
+class SkillTaxonomy:
+    """Loaded taxonomy: one trie walk over the text finds every skill, as canonical IDs."""
+
+    def __init__(self, compiled):
+        self.version = compiled["version"]
+        self.skills = compiled["skills"]
+        self.order = compiled["order"]
+        self._trie = compiled["trie"]
+        self._lookup = compiled["lookup"]
+        self.names = [self.skills[sid]["name"] for sid in self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def find(self, text):
+        """Canonical IDs of every skill mentioned in `text`, in order of first mention."""
+        tokens = tokenize(text)
+        lower = [t.lower() for t in tokens]
+        n = len(tokens)
+        found = {}
+        for i in range(n):
+            node = self._trie.get(lower[i])
+            j = i + 1
+            while node is not None:
+                ends = node.get(_END)
+                if ends:
+                    for sid, rejected in ends:
+                        if rejected is None or tuple(tokens[i:j]) not in rejected:
+                            found[sid] = None
+                if j == n:
+                    break
+                node = node.get(lower[j])
+                j += 1
+        return list(found)
+
+    def resolve(self, term):
+        """Canonical ID for a skill name or alias (any case), or None if it isn't in the taxonomy."""
+        return self._lookup.get(_key(term))
+
+    def key(self, term):
+        """Canonical ID if the term is a known skill, else the lowercased term (for de-duplicating skill lists)."""
+        return self.resolve(term) or term.lower()
+
+    def vocabulary(self, extra=()):
+        """Every canonical skill name plus the `extra` terms not already covered (aliases and case folded)."""
+        vocab = list(self.names)
+        seen = set(self.order)
+        for term in extra:
+            if self.key(term) not in seen:
+                seen.add(self.key(term))
+                vocab.append(term)
+        return vocab
+
+    def name(self, sid):
+        return self.skills[sid]["name"]
+
+    def question(self, sid):
+        return self.skills[sid]["question"] if sid in self.skills else None
+
+def _trusted(artifact, source):
+    """The artifact is only unpickled if the source's owner made it and nobody else can rewrite it."""
+    info = os.stat(artifact)
+    return info.st_uid == os.stat(source).st_uid and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+def load_taxonomy(source=TAXONOMY_SOURCE, artifact=TAXONOMY_ARTIFACT):
+    """Loads the compiled artifact, or compiles the source in memory if it is missing, stale or untrusted."""
+    version = source_version(source)
+    try:
+        if _trusted(artifact, source):
+            with open(artifact, "rb") as f:
+                compiled = pickle.load(f)
+            if compiled.get("format") == ARTIFACT_FORMAT and compiled.get("version") == version:
+                return SkillTaxonomy(compiled)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    return SkillTaxonomy(compile_taxonomy(source))
+
+def check(taxonomy):
+    """Runs MATCH_CHECKS against `taxonomy`; returns a description of each failure."""
+    failed = []
+    for text, sid, expected in MATCH_CHECKS:
+        if (sid in taxonomy.find(text)) != expected:
+            failed.append(f"  {text!r}: {sid} {'not found' if expected else 'found'}")
+    return failed
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Returns the shared taxonomy, loading it on first call."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = load_taxonomy()
+    return _taxonomy
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "compile"
+    if command == "compile":
+        failed = check(SkillTaxonomy(compile_taxonomy()))
+        if failed:
+            print("❌ Match checks failed:\n" + "\n".join(failed))
+            sys.exit(1)
+        compiled = build_artifact()
+        print(f"✅ Compiled {len(compiled['order'])} skills (version {compiled['version']}) -> {TAXONOMY_ARTIFACT}")
+    elif command == "check":
+        failed = check(get_taxonomy())
+        print("❌ Match checks failed:\n" + "\n".join(failed) if failed else f"✅ {len(MATCH_CHECKS)} match checks passed")
+        sys.exit(1 if failed else 0)
+    elif command == "find" and len(sys.argv) > 2:
+        taxonomy = get_taxonomy()
+        with open(sys.argv[2], encoding="utf-8") as f:
+            for sid in taxonomy.find(f.read()):
+                print(f"{sid:24} {taxonomy.name(sid)}")
+    else:
+        print("usage: python skills_taxonomy.py compile | check | find <text file>")
+        sys.exit(2)
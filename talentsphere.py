@@ -0,0 +1,209 @@
+"""
+Headless command line for offline ranking (no Streamlit involved).
+
+    python -m talentsphere rank ./intake --skills "Python, SQL, AWS" --workers 8 --out ranking.csv
+    python -m talentsphere rank intake.zip --skills "Python, SQL" --out - --format jsonl --save
+    python -m talentsphere rank intake.tar.gz --skills "Python, SQL" --workers 4 --max-in-flight 8
+    python -m talentsphere rank ./intake --skills "Python, SQL" --out ranking.parquet
+
+Rows are written as each resume finishes, so memory stays flat however many files there are.
+With --top K only the K best rows are kept and written, sorted, at the end.
+"""
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+from batch_engine import rank_resumes, default_workers, DEFAULT_BATCH_SIZE
+from archive_ingest import ArchiveReader, is_archive
+
+COLUMNS = ["Name", "Score", "Experience (Yrs)", "Email", "Phone", "Skills"]
+FORMAT_EXTENSIONS = {"jsonl": (".jsonl", ".json"), "parquet": (".parquet",), "arrow": (".arrow", ".feather")}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+SAVE_CHUNK = 100
+PROGRESS_EVERY = 100
+
+def iter_inputs(paths):
+    """
+    Lazily yields (name, source) for every PDF under the given directories, ZIP/tar archives or files.
+    Directory entries are yielded as paths (workers read them); archive members as bytes, one at a time
+    (non-PDF, oversized or corrupt members are skipped and reported, see archive_ingest).
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        full = os.path.join(root, name)
+                        yield os.path.relpath(full, path), full
+        elif is_archive(path):
+            reader = ArchiveReader(path)
+            yield from reader
+            if reader.errors:
+                print(f"⚠️ {path}: {len(reader.errors)} members skipped", file=sys.stderr)
+        elif os.path.isfile(path):
+            yield os.path.basename(path), path
+        else:
+            print(f"⚠️ Skipping {path}: not a file, directory or archive", file=sys.stderr)
+
+def to_row(name, parser, flag_duplicates=False):
+    data = parser.parsed_data
+    row = {
+        "Name": name,
+        "Score": data["match_score"],
+        "Experience (Yrs)": data["years_experience"],
+        "Email": data["contact_info"]["email"],
+        "Phone": data["contact_info"]["phone"],
+        "Skills": ", ".join(data["skills_found"])
+    }
+    if flag_duplicates:
+        row["Duplicate Of"] = data["duplicate_of"] or ""
+    return row
+
+class RowWriter:
+    """Writes ranking rows as CSV or JSON Lines, flushing each one so partial output is usable."""
+
+    def __init__(self, stream, fmt, columns=COLUMNS):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=columns)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+def _open_output(path, binary=False):
+    if path == "-":
+        return sys.stdout.buffer if binary else sys.stdout
+    return open(path, "wb") if binary else open(path, "w", newline="", encoding="utf-8")
+
+def _format_for(args):
+    if args.format:
+        return args.format
+    for fmt, extensions in FORMAT_EXTENSIONS.items():
+        if args.out.endswith(extensions):
+            return fmt
+    return "csv"
+
+def rank_command(args):
+    keywords = [s.strip() for s in args.skills.split(",") if s.strip()]
+    if not keywords:
+        print("⚠️ --skills needs at least one keyword", file=sys.stderr)
+        return 2
+
+    cache = None
+    if not args.no_cache:
+        from resume_cache import ResumeCache
+        cache = ResumeCache()
+
+    # The database is only touched (and its schema created) when saving
+    if args.save:
+        from db_handler import bootstrap, save_scan_results
+        from candidate_store import save_candidates
+        bootstrap()
+    scan_rows, parsed = [], []
+
+    def flush():
+        if scan_rows:
+            save_scan_results(scan_rows)
+            save_candidates(parsed, args.company)
+            scan_rows.clear()
+            parsed.clear()
+
+    dedup = None
+    if args.dedup:
+        from dedup import DedupIndex
+        dedup = DedupIndex(args.dedup_threshold, args.dedup)
+    flag = args.dedup == "flag"
+
+    fmt = _format_for(args)
+    store = None
+    if fmt in COLUMNAR_FORMATS:
+        # Collected as typed columns and written ranked at the end (see result_store)
+        from result_store import ResultStore
+        store = ResultStore()
+    out = _open_output(args.out, binary=store is not None)
+    writer = RowWriter(out, fmt, COLUMNS + ["Duplicate Of"] if flag else COLUMNS) if store is None else None
+    top = []   # min-heap of (score, experience, seq, row) when --top is set
+    start = time.perf_counter()
+    count = skipped = 0
+    try:
+        results = rank_resumes(iter_inputs(args.inputs), keywords, workers=args.workers,
+                               batch_size=args.batch_size, cache=cache, dedup=dedup, max_in_flight=args.max_in_flight)
+        for count, (name, parser) in enumerate(results, 1):
+            if parser is None:
+                # Collapsed near-duplicate: nothing was scored
+                skipped += 1
+                continue
+            row = to_row(name, parser, flag)
+            if store is not None:
+                store.append_parser(name, parser)
+            elif args.top:
+                item = (row["Score"], row["Experience (Yrs)"], -count, row)
+                if len(top) < args.top:
+                    heapq.heappush(top, item)
+                else:
+                    heapq.heappushpop(top, item)
+            else:
+                writer.write(row)
+
+            if args.save:
+                scan_rows.append((args.user, args.job_role, row["Score"], name, parser.parsed_data["missing_keywords"]))
+                parsed.append((name, parser))
+                if len(scan_rows) >= SAVE_CHUNK:
+                    flush()
+
+            if count % PROGRESS_EVERY == 0:
+                print(f"... {count} resumes ranked ({count / (time.perf_counter() - start):.1f}/s)", file=sys.stderr)
+
+        for *_, row in sorted(top, reverse=True):
+            writer.write(row)
+        if store is not None:
+            store.export(fmt, out, limit=args.top)
+        if args.save:
+            flush()
+    finally:
+        if out not in (sys.stdout, sys.stdout.buffer):
+            out.close()
+
+    print(f"✅ Ranked {count - skipped} resumes in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    if dedup is not None and dedup.duplicates:
+        print(f"🧬 {len(dedup.duplicates)} near-duplicates {'skipped' if dedup.collapse else 'flagged'}", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="talentsphere", description="TalentSphere AI command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rank = commands.add_parser("rank", help="rank a directory or archive of PDF resumes")
+    rank.add_argument("inputs", nargs="+", help="directories, ZIP/tar archives or PDF files")
+    rank.add_argument("--skills", required=True, help='required skills, comma separated (e.g. "Python, SQL")')
+    rank.add_argument("--workers", type=int, default=default_workers(), help="extraction worker processes")
+    rank.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="resumes scored per chunk")
+    rank.add_argument("--max-in-flight", type=int, help="PDFs read ahead of scoring (default: 2 per worker)")
+    rank.add_argument("--out", default="-", help="output file (default: stdout)")
+    rank.add_argument("--format", choices=["csv", "jsonl"] + list(COLUMNAR_FORMATS),
+                      help="output format (default: from --out extension, else csv); parquet/arrow are written ranked at the end")
+    rank.add_argument("--top", type=int, help="only write the K best candidates, sorted by score")
+    rank.add_argument("--dedup", choices=["flag", "collapse"], help="detect near-duplicate resumes: mark them, or skip scoring them")
+    rank.add_argument("--dedup-threshold", type=float, default=0.9, help="similarity (0-1) above which resumes count as duplicates")
+    rank.add_argument("--no-cache", action="store_true", help="don't read or fill the extraction cache")
+    rank.add_argument("--save", action="store_true", help="also store scans and candidates in the database")
+    rank.add_argument("--user", default="admin", help="recruiter the saved scans belong to")
+    rank.add_argument("--company", default="General", help="company the saved candidates belong to")
+    rank.add_argument("--job-role", default="General", help="job role recorded with the saved scans")
+    rank.set_defaults(func=rank_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())